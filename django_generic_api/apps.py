@@ -1,9 +1,12 @@
 from django.apps import AppConfig
 from django.conf import settings
+from django.core.signals import setting_changed
+from django.db.models.signals import class_prepared, post_delete, post_save
 
 from .config import (
     user_rate,
     anon_rate,
+    track_model_versions,
 )
 
 
@@ -37,3 +40,28 @@ class DjangoGenericApiConfig(AppConfig):
         for key, value in DEFAULT_DRF_THROTTLE_SETTINGS.items():
             if not settings.REST_FRAMEWORK.get(key):
                 settings.REST_FRAMEWORK[key] = value
+
+        # Build the model registry once, rebuild it only when the app
+        # registry changes.
+        from .services import build_model_registry, clear_model_registry
+
+        build_model_registry()
+        class_prepared.connect(
+            clear_model_registry, dispatch_uid="dga_clear_model_registry"
+        )
+        setting_changed.connect(
+            clear_model_registry, dispatch_uid="dga_clear_model_registry"
+        )
+
+        # Cached fetch results and ETags change when their models change.
+        if track_model_versions:
+            from .services import bump_model_version_on_change
+
+            post_save.connect(
+                bump_model_version_on_change,
+                dispatch_uid="dga_bump_model_version_on_save",
+            )
+            post_delete.connect(
+                bump_model_version_on_change,
+                dispatch_uid="dga_bump_model_version_on_delete",
+            )
@@ -40,6 +40,85 @@ try:
     create_batch_size = config.getint(
         "SAVE_SETTINGS", "CREATE_BATCH_SIZE", fallback=10
     )
+    # Rows per INSERT statement of multi-record saves, capped by the
+    # database backend limits.
+    bulk_create_batch_size = config.getint(
+        "SAVE_SETTINGS", "BULK_CREATE_BATCH_SIZE", fallback=500
+    )
+
+    # Fetch: rows counted at most by the 'capped' count mode
+    count_cap = config.getint("FETCH_SETTINGS", "COUNT_CAP", fallback=1000)
+
+    # Fetch: seconds exact counts are cached, 0 disables the cache
+    count_cache_timeout = config.getint(
+        "FETCH_SETTINGS", "COUNT_CACHE_TIMEOUT", fallback=0
+    )
+
+    # Fetch: seconds fetch responses are cached, 0 disables the cache
+    result_cache_timeout = config.getint(
+        "FETCH_SETTINGS", "RESULT_CACHE_TIMEOUT", fallback=0
+    )
+
+    # Fetch: ETag / If-None-Match support on fetch responses
+    fetch_etag = config.getboolean("FETCH_SETTINGS", "ETAG", fallback=False)
+
+    # Model change versions are kept for the result cache and ETags
+    track_model_versions = bool(result_cache_timeout) or fetch_etag
+
+    # Fetch: nesting levels and filters allowed in a filter group
+    filter_group_max_depth = config.getint(
+        "FETCH_SETTINGS", "FILTER_GROUP_MAX_DEPTH", fallback=5
+    )
+    filter_group_max_filters = config.getint(
+        "FETCH_SETTINGS", "FILTER_GROUP_MAX_FILTERS", fallback=50
+    )
+
+    # Fetch: 'in' filter values above which the list is sent as one
+    # parameter
+    large_in_threshold = config.getint(
+        "FETCH_SETTINGS", "LARGE_IN_THRESHOLD", fallback=500
+    )
+
+    # Fetch: PostgreSQL text search configuration of the search operator
+    search_config = config.get(
+        "FETCH_SETTINGS", "SEARCH_CONFIG", fallback="english"
+    )
+    if not search_config.replace("_", "").isalnum():
+        raise ValueError(
+            f"Improperly configured: SEARCH_CONFIG {search_config}"
+        )
+
+    # Fetch: nesting levels of relations, and related records kept per
+    # record of a to-many relation
+    nested_max_depth = config.getint(
+        "FETCH_SETTINGS", "NESTED_MAX_DEPTH", fallback=3
+    )
+    nested_max_children = config.getint(
+        "FETCH_SETTINGS", "NESTED_MAX_CHILDREN", fallback=100
+    )
+
+    # Export: rows read from the database cursor per chunk
+    export_chunk_size = config.getint(
+        "FETCH_SETTINGS", "EXPORT_CHUNK_SIZE", fallback=2000
+    )
+
+    # Batch: operations allowed in a batch, and threads running its fetches
+    batch_max_operations = config.getint(
+        "BATCH_SETTINGS", "MAX_OPERATIONS", fallback=20
+    )
+    batch_max_workers = config.getint(
+        "BATCH_SETTINGS", "MAX_WORKERS", fallback=4
+    )
+
+    # Number of generated Pydantic schemas kept per worker
+    schema_cache_size = config.getint(
+        "CACHE_SETTINGS", "SCHEMA_CACHE_SIZE", fallback=128
+    )
+
+    # Number of compiled fetch filter plans kept per worker
+    filter_plan_cache_size = config.getint(
+        "CACHE_SETTINGS", "FILTER_PLAN_CACHE_SIZE", fallback=256
+    )
 
     # Email activation link expiry hours
     expiry_hours = config.getint(
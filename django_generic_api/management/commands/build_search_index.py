@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from ...services import build_search_index, get_model_by_name
+
+
+class Command(BaseCommand):
+    help = "Builds or refreshes the full-text search index of model fields."
+
+    def add_arguments(self, parser):
+        parser.add_argument("model_name", help="Model as app_label.model")
+        parser.add_argument("fields", nargs="+", help="Text fields to index")
+        parser.add_argument(
+            "--drop",
+            action="store_true",
+            help="Drops the search index instead of building it.",
+        )
+
+    def handle(self, *args, **options):
+        action = "Dropped" if options["drop"] else "Built"
+        try:
+            model = get_model_by_name(options["model_name"])
+            for field_name in options["fields"]:
+                build_search_index(model, field_name, drop=options["drop"])
+                self.stdout.write(
+                    f"{action} search index of {options['model_name']}."
+                    f"{field_name}"
+                )
+        except Exception as e:
+            # info: service errors carry the structured error in args[0]
+            error = e.args[0] if e.args else e
+            if isinstance(error, dict):
+                raise CommandError(f"{error['code']}: {error['error']}")
+            raise
@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import Optional, Any, List, Union
+from typing import Optional, Any, Dict, List, Union
 
 from django.conf import settings
 from pydantic import (
@@ -12,6 +12,13 @@ from pydantic import (
     model_validator,
 )
 
+from .config import (
+    batch_max_operations,
+    filter_group_max_depth,
+    filter_group_max_filters,
+    nested_max_children,
+    nested_max_depth,
+)
 from .utils import PydanticConfigV1
 
 
@@ -19,6 +26,8 @@ class SavePayload(BaseModel, PydanticConfigV1):
     modelName: str
     id: Optional[Union[int, str]] = None
     saveInput: JsonValue
+    # info: unique field names used to create or update records
+    upsert: Optional[List[str]] = Field(default=None, min_length=1)
 
 
 class GenericUserUpdatePayload(BaseModel, PydanticConfigV1):
@@ -32,6 +41,16 @@ class OperatorByEnum(str, Enum):
     GT = "gt"
     LIKE = "like"
     ILIKE = "ilike"
+    GTE = "gte"
+    LT = "lt"
+    LTE = "lte"
+    RANGE = "range"
+    STARTSWITH = "startswith"
+    ISTARTSWITH = "istartswith"
+    ENDSWITH = "endswith"
+    ISNULL = "isnull"
+    IN_QUERY = "inQuery"
+    SEARCH = "search"
 
 
 class OperationByEnum(str, Enum):
@@ -45,40 +64,397 @@ class FetchFilter(BaseModel, PydanticConfigV1):
     value: List[Any]
     operation: Optional[OperationByEnum] = OperationByEnum.AND
 
+    @model_validator(mode="after")
+    def validate_in_query(self):
+        if self.operator == OperatorByEnum.IN_QUERY:
+            if len(self.value) != 1:
+                raise ValueError("inQuery filters must have one value")
+            self.value = [InQuerySpec.model_validate(self.value[0])]
+        return self
+
+
+# info: value of an 'inQuery' filter, the records of another model whose
+# 'field' values the filtered field must be in
+class InQuerySpec(BaseModel, PydanticConfigV1):
+    modelName: str
+    field: str
+    filters: Optional[List[FetchFilter]] = []
+
+    @field_validator("filters")
+    def validate_filters(cls, v):
+        for f in v or []:
+            if f.operator == OperatorByEnum.IN_QUERY:
+                raise ValueError("inQuery filters cannot be nested")
+        return validate_filter_values(v)
+
 
 class OrderByEnum(str, Enum):
     asc = "asc"
     desc = "desc"
 
 
+class NullsEnum(str, Enum):
+    FIRST = "first"
+    LAST = "last"
+
+
 class FetchSort(BaseModel, PydanticConfigV1):
     field: str
     order_by: OrderByEnum
+    # info: where NULL values are ordered, the database default if not set
+    nulls: Optional[NullsEnum] = None
+
+
+def validate_sort_keys(sort):
+    """
+    Returns the sort keys of a sort given as one key or a list of keys.
+    """
+    if isinstance(sort, dict):
+        return [sort]
+    return sort
+
+
+class PaginationEnum(str, Enum):
+    OFFSET = "offset"
+    CURSOR = "cursor"
+
+
+class CountModeEnum(str, Enum):
+    EXACT = "exact"
+    CAPPED = "capped"
+    ESTIMATED = "estimated"
+    NONE = "none"
+
+
+def validate_filter_values(filters):
+    """
+    Checks the number and type of values of each filter for its operator.
+    """
+    if filters:
+        for f in filters:
+            value = getattr(f, "value", [])
+            len_value = len(value)
+            operator = getattr(f, "operator", "")
+
+            if len_value < 1:
+                raise ValueError("Filters must have at least one value")
+            elif operator == OperatorByEnum.RANGE:
+                if len_value != 2:
+                    raise ValueError("Range filters must have two values")
+            elif len_value > 1 and operator != OperatorByEnum.IN:
+                raise ValueError("Multiple filters not supported")
+            elif operator == OperatorByEnum.ISNULL and not isinstance(
+                value[0], bool
+            ):
+                raise ValueError("Isnull filters must have a boolean value")
+            elif operator == OperatorByEnum.SEARCH and not (
+                isinstance(value[0], str) and value[0].strip()
+            ):
+                raise ValueError("Search filters must have a text value")
+    return filters
+
+
+class GroupOperationEnum(str, Enum):
+    AND = "and"
+    OR = "or"
+    NOT = "not"
 
 
-class FetchPayload(BaseModel, PydanticConfigV1):
+# info: filters and nested groups combined by the group operation, 'not'
+# negates the 'and' of its children. The 'operation' of the filters is not
+# used inside a group.
+class FetchFilterGroup(BaseModel, PydanticConfigV1):
+    operation: GroupOperationEnum
+    filters: Optional[List[FetchFilter]] = []
+    groups: Optional[List["FetchFilterGroup"]] = []
+
+    @field_validator("filters")
+    def validate_filters(cls, v):
+        return validate_filter_values(v)
+
+    @model_validator(mode="after")
+    def validate_children(self):
+        if not self.filters and not self.groups:
+            raise ValueError("Filter groups must have at least one child")
+        return self
+
+    def get_depth(self):
+        """
+        Returns the number of nested group levels, 1 for a group without
+        groups.
+        """
+        return 1 + max(
+            (group.get_depth() for group in self.groups or []), default=0
+        )
+
+    def get_filters(self):
+        """
+        Returns the filters of the group and its nested groups, depth first.
+        """
+        filters = list(self.filters or [])
+        for group in self.groups or []:
+            filters.extend(group.get_filters())
+        return filters
+
+
+class FetchRelation(BaseModel, PydanticConfigV1):
+    # info: forward, reverse or many-to-many relation name
+    name: str
+    fields: List[str] = Field(min_length=1)
+    relations: Optional[List["FetchRelation"]] = []
+    # info: related records kept per record, for to-many relations
+    limit: Optional[int] = Field(default=None, ge=1, le=nested_max_children)
+    sort: Optional[List[FetchSort]] = Field(default=None, min_length=1)
+
+    @field_validator("sort", mode="before")
+    def validate_sort(cls, v):
+        return validate_sort_keys(v)
+
+    @field_validator("fields")
+    def validate_fields(cls, v):
+        # info: related fields are nested with 'relations', a path would
+        # join its relation into the query of the parent records
+        if any("__" in field for field in v):
+            raise ValueError("Relation fields must be fields of the relation")
+        return v
+
+    @model_validator(mode="after")
+    def validate_relations(self):
+        validate_relation_names(self.relations, self.fields)
+        return self
+
+    def get_depth(self):
+        """
+        Returns the number of nested relation levels, 1 for a relation
+        without relations.
+        """
+        return 1 + max(
+            (relation.get_depth() for relation in self.relations or []),
+            default=0,
+        )
+
+
+def validate_relation_names(relations, fields):
+    """
+    Checks the relation names of a level are unique and are not fields, as
+    both are keys of the same records.
+    """
+    names = [relation.name for relation in relations or []]
+    if len(set(names)) != len(names) or set(names) & set(fields):
+        raise ValueError("Relation names must be unique and not fields")
+    return relations
+
+
+# info: model, fields and filters shared by the fetch and export payloads
+class FetchQueryPayload(BaseModel, PydanticConfigV1):
     modelName: str
     fields: List[str]
     filters: List[FetchFilter]
-    pageNumber: Optional[int] = Field(default=1, ge=1)
-    pageSize: Optional[int] = Field(default=10, ge=1, le=100)
-    sort: Optional[FetchSort] = None
-    distinct: Optional[bool] = None
+    # info: nested and/or/not filters, combined with 'filters' by 'and'
+    filterGroup: Optional[FetchFilterGroup] = None
 
     @field_validator("filters")
     def validate_filters(cls, v):
+        return validate_filter_values(v)
+
+    def get_filters(self):
+        """
+        Returns the filters and the filters of the filter group.
+        """
+        filters = list(self.filters)
+        if self.filterGroup:
+            filters.extend(self.filterGroup.get_filters())
+        return filters
+
+    @field_validator("filterGroup")
+    def validate_filter_group(cls, v):
         if v:
-            for f in v:
-                value = getattr(f, "value", [])
-                len_value = len(value)
-                operator = getattr(f, "operator", "")
-
-                if len_value < 1:
-                    raise ValueError("Filters must have at least one value")
-                elif len_value > 1 and operator != OperatorByEnum.IN:
-                    raise ValueError("Multiple filters not supported")
+            if v.get_depth() > filter_group_max_depth:
+                raise ValueError(
+                    f"Filter groups are limited to {filter_group_max_depth} "
+                    "levels"
+                )
+            if len(v.get_filters()) > filter_group_max_filters:
+                raise ValueError(
+                    f"Filter groups are limited to "
+                    f"{filter_group_max_filters} filters"
+                )
+        return v
+
+
+class FetchPayload(FetchQueryPayload):
+    pageNumber: Optional[int] = Field(default=1, ge=1)
+    pageSize: Optional[int] = Field(default=10, ge=1, le=100)
+    # info: one sort key or a list of keys, the pk is added as tiebreaker
+    sort: Optional[List[FetchSort]] = Field(default=None, min_length=1)
+    # info: None applies DISTINCT only where joins can repeat records
+    distinct: Optional[bool] = None
+    # info: DISTINCT ON fields, on backends supporting it (PostgreSQL)
+    distinctOn: Optional[List[str]] = Field(default=None, min_length=1)
+    pagination: Optional[PaginationEnum] = PaginationEnum.OFFSET
+    # info: nextCursor of the previous page, for cursor pagination
+    cursor: Optional[str] = None
+    countMode: Optional[CountModeEnum] = CountModeEnum.EXACT
+    # info: rows counted at most by the 'capped' count mode
+    countCap: Optional[int] = Field(default=None, ge=1)
+    # info: orders the best matches of the 'search' filter first
+    searchRank: Optional[bool] = False
+    # info: related records nested in every fetched record
+    relations: Optional[List[FetchRelation]] = Field(
+        default=None, min_length=1
+    )
+    # info: fields whose most frequent values are counted, see facetSize
+    facets: Optional[List[str]] = Field(
+        default=None, min_length=1, max_length=10
+    )
+    facetSize: Optional[int] = Field(default=10, ge=1, le=100)
+
+    @field_validator("sort", mode="before")
+    def validate_sort(cls, v):
+        return validate_sort_keys(v)
+
+    @model_validator(mode="after")
+    def validate_cursor(self):
+        if self.cursor and self.pagination != PaginationEnum.CURSOR:
+            raise ValueError("Cursor is only supported for cursor pagination")
+        if self.pagination == PaginationEnum.CURSOR and self.sort:
+            if len(self.sort) > 1 or self.sort[0].nulls:
+                raise ValueError(
+                    "Cursor pagination supports one sort key, without nulls"
+                )
+        return self
+
+    @model_validator(mode="after")
+    def validate_distinct_on(self):
+        if self.distinctOn:
+            if self.pagination == PaginationEnum.CURSOR:
+                raise ValueError(
+                    "Distinct on is only supported for offset pagination"
+                )
+            if self.distinct is False:
+                raise ValueError("Distinct on cannot be used without distinct")
+        return self
+
+    @model_validator(mode="after")
+    def validate_relations(self):
+        if self.relations:
+            validate_relation_names(self.relations, self.fields)
+            if max(r.get_depth() for r in self.relations) > nested_max_depth:
+                raise ValueError(
+                    f"Relations are limited to {nested_max_depth} levels"
+                )
+            if self.pagination == PaginationEnum.CURSOR:
+                raise ValueError(
+                    "Relations are only supported for offset pagination"
+                )
+            if self.distinct or self.distinctOn:
+                raise ValueError("Relations cannot be used with distinct")
+        return self
+
+    @field_validator("facets")
+    def validate_facets(cls, v):
+        if v and len(set(v)) != len(v):
+            raise ValueError("Facet fields must be unique")
         return v
 
+    @model_validator(mode="after")
+    def validate_search_rank(self):
+        if self.searchRank:
+            if self.pagination == PaginationEnum.CURSOR:
+                raise ValueError(
+                    "Search rank is only supported for offset pagination"
+                )
+            if not any(
+                f.operator == OperatorByEnum.SEARCH for f in self.get_filters()
+            ):
+                raise ValueError("Search rank needs a search filter")
+        return self
+
+
+class AggregateFunctionEnum(str, Enum):
+    COUNT = "count"
+    SUM = "sum"
+    AVG = "avg"
+    MIN = "min"
+    MAX = "max"
+    COUNT_DISTINCT = "countDistinct"
+
+
+class AggregateMeasure(BaseModel, PydanticConfigV1):
+    function: AggregateFunctionEnum
+    # info: the records are counted when no field is given
+    field: Optional[str] = None
+    # info: key of the measure in the groups, "<function>_<field>" by default
+    alias: Optional[str] = Field(default=None, pattern=r"^[A-Za-z]\w*$")
+
+    @model_validator(mode="after")
+    def validate_field(self):
+        if not self.field and self.function != AggregateFunctionEnum.COUNT:
+            raise ValueError(f"Field is required for {self.function.value}")
+        return self
+
+    def get_alias(self):
+        """
+        Returns the key of the measure in the groups.
+        """
+        if self.alias:
+            return self.alias
+        if not self.field:
+            return self.function.value
+        return f"{self.function.value}_{self.field.replace('__', '_')}"
+
+
+# info: 'fields' are the group-by fields of the aggregate
+class AggregatePayload(FetchQueryPayload):
+    measures: List[AggregateMeasure] = Field(min_length=1)
+    pageNumber: Optional[int] = Field(default=1, ge=1)
+    pageSize: Optional[int] = Field(default=10, ge=1, le=100)
+    # info: by a group-by field or a measure alias
+    sort: Optional[FetchSort] = None
+
+    @model_validator(mode="after")
+    def validate_aliases(self):
+        aliases = [measure.get_alias() for measure in self.measures]
+        if len(set(aliases)) != len(aliases):
+            raise ValueError("Measure aliases must be unique")
+        if set(aliases) & set(self.fields):
+            raise ValueError("Measure aliases must differ from the fields")
+        if self.sort and self.sort.field not in [*self.fields, *aliases]:
+            raise ValueError("Sort field must be a field or a measure alias")
+        return self
+
+
+class ExportFormatEnum(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class ExportPayload(FetchQueryPayload):
+    sort: Optional[List[FetchSort]] = Field(default=None, min_length=1)
+    distinct: Optional[bool] = None
+    format: Optional[ExportFormatEnum] = ExportFormatEnum.NDJSON
+
+    @field_validator("sort", mode="before")
+    def validate_sort(cls, v):
+        return validate_sort_keys(v)
+
+
+class BatchOperationEnum(str, Enum):
+    FETCH = "fetch"
+    SAVE = "save"
+
+
+class BatchOperation(BaseModel, PydanticConfigV1):
+    type: BatchOperationEnum
+    # info: the variables of a fetch or save payload
+    variables: Dict[str, Any]
+
+
+class BatchPayload(BaseModel, PydanticConfigV1):
+    operations: List[BatchOperation] = Field(
+        min_length=1, max_length=batch_max_operations
+    )
+
 
 class GenericLoginPayload(BaseModel, PydanticConfigV1):
     email: EmailStr
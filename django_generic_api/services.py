@@ -1,22 +1,61 @@
-from typing import Dict, Optional
+import base64
+import csv
+import hashlib
+import json
+import time
+from functools import lru_cache, partial
+from types import MappingProxyType
+from typing import Dict, List, Optional
+from uuid import UUID
 
 from django.apps import apps
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
-from django.db.models import Q
+from django.db import connections, router, transaction
+from django.db.backends.utils import truncate_name
+from django.db.models import (
+    Avg,
+    Count,
+    F,
+    FloatField,
+    Max,
+    Min,
+    Q,
+    Subquery,
+    Sum,
+    Window,
+)
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import RowNumber
 from pydantic import (
     create_model,
     Field,
+    TypeAdapter,
+    ValidationError as PydanticValidationError,
 )
 from django.db.models.fields.related import ForeignKey
 from pydantic.config import ConfigDict
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from .config import (
+    bulk_create_batch_size,
+    count_cache_timeout,
+    count_cap as default_count_cap,
+    export_chunk_size,
+    filter_plan_cache_size,
+    large_in_threshold,
+    nested_max_children,
+    search_config,
+    result_cache_timeout,
+    schema_cache_size,
+)
 from .utils import (
-    get_model_fields_with_properties,
+    EchoBuffer,
+    PreciseJSONEncoder,
+    get_field_index,
     is_fields_exist,
-    DJANGO_TO_PYDANTIC_TYPE_MAP,
     str_field_to_model_field,
     error_response,
     raise_exception,
@@ -32,30 +71,228 @@ DEFAULT_APPS = {
 }
 
 
+# info: model lookup table built once by `DjangoGenericApiConfig.ready()`,
+# maps "app_label.model", "model" and "verbose name" keys to model classes.
+# Names that do not resolve are cached as None.
+MODEL_REGISTRY: Dict[str, Optional[type]] = {}
+
+# Upper bound on cached misses, so random model names cannot grow the
+# registry without limit.
+MAX_MISSING_MODEL_NAMES = 1024
+
+# Seconds a fetch result lock is held, and waited for by other callers.
+FETCH_LOCK_TIMEOUT = 10
+FETCH_LOCK_POLL_INTERVAL = 0.05
+
+# Filter operator to (lookup, takes every value, negated).
+FILTER_LOOKUPS = {
+    "eq": ("exact", False, False),
+    "in": ("in", True, False),
+    "not": ("exact", False, True),
+    "gt": ("gt", False, False),
+    "like": ("contains", False, False),
+    "ilike": ("icontains", False, False),
+    "gte": ("gte", False, False),
+    "lt": ("lt", False, False),
+    "lte": ("lte", False, False),
+    "range": ("range", True, False),
+    # info: prefix lookups compile to LIKE 'value%', which can use an index
+    "startswith": ("startswith", False, False),
+    "istartswith": ("istartswith", False, False),
+    "endswith": ("endswith", False, False),
+    "isnull": ("isnull", False, False),
+}
+
+# Subquery expanding a JSON array parameter into rows, used for large 'in'
+# filters on the backends that support it.
+JSON_ARRAY_ROWS_SQL = {
+    "sqlite": "SELECT value FROM json_each(%s)",
+    "postgresql": "SELECT jsonb_array_elements_text(%s::jsonb)::{db_type}",
+}
+
+# Full-text search SQL per database vendor. 'filter' selects the primary
+# keys of the matching records, 'rank' scores a record (higher is better).
+SEARCH_SQL = {
+    "sqlite": {
+        "create": [
+            'CREATE VIRTUAL TABLE IF NOT EXISTS "{index}" USING fts5('
+            "\"{column}\", content='{table}', content_rowid='{pk}')",
+            'CREATE TRIGGER IF NOT EXISTS "{index}_ai" AFTER INSERT ON '
+            '"{table}" BEGIN INSERT INTO "{index}"(rowid, "{column}") '
+            'VALUES (new."{pk}", new."{column}"); END',
+            'CREATE TRIGGER IF NOT EXISTS "{index}_ad" AFTER DELETE ON '
+            '"{table}" BEGIN INSERT INTO "{index}"("{index}", rowid, '
+            '"{column}") VALUES (\'delete\', old."{pk}", old."{column}"); END',
+            'CREATE TRIGGER IF NOT EXISTS "{index}_au" AFTER UPDATE ON '
+            '"{table}" BEGIN INSERT INTO "{index}"("{index}", rowid, '
+            '"{column}") VALUES (\'delete\', old."{pk}", old."{column}"); '
+            'INSERT INTO "{index}"(rowid, "{column}") '
+            'VALUES (new."{pk}", new."{column}"); END',
+        ],
+        "refresh": [
+            'INSERT INTO "{index}"("{index}") VALUES (\'rebuild\')',
+        ],
+        "drop": [
+            'DROP TRIGGER IF EXISTS "{index}_ai"',
+            'DROP TRIGGER IF EXISTS "{index}_ad"',
+            'DROP TRIGGER IF EXISTS "{index}_au"',
+            'DROP TABLE IF EXISTS "{index}"',
+        ],
+        # info: the SQLite search reads its own index table, so it must exist
+        "exists": "SELECT name FROM sqlite_master WHERE type = 'table' "
+        "AND name = '{index}'",
+        "filter": 'SELECT rowid FROM "{index}" WHERE "{index}" MATCH %s',
+        "rank": '(SELECT -rank FROM "{index}" WHERE "{index}" MATCH %s '
+        'AND rowid = "{table}"."{pk}")',
+    },
+    "postgresql": {
+        "create": [
+            'CREATE INDEX IF NOT EXISTS "{index}" ON "{table}" USING GIN '
+            "(to_tsvector('{config}'::regconfig, "
+            "COALESCE(\"{column}\"::text, '')))",
+        ],
+        "refresh": ['REINDEX INDEX "{index}"'],
+        "drop": ['DROP INDEX IF EXISTS "{index}"'],
+        "filter": 'SELECT "{pk}" FROM "{table}" WHERE '
+        "to_tsvector('{config}'::regconfig, COALESCE(\"{column}\"::text, '')) "
+        "@@ plainto_tsquery('{config}'::regconfig, %s)",
+        "rank": "ts_rank(to_tsvector('{config}'::regconfig, "
+        'COALESCE("{table}"."{column}"::text, \'\')), '
+        "plainto_tsquery('{config}'::regconfig, %s))",
+    },
+}
+
+# Text fields the search operator can be used on.
+SEARCH_FIELD_TYPES = {
+    "CharField",
+    "EmailField",
+    "SlugField",
+    "TextField",
+    "URLField",
+}
+
+# Facet counts of all the facet fields in one query, ranked per facet.
+FACET_GROUPING_SETS_SQL = {
+    "postgresql": "SELECT dga_facet_set, {columns}, dga_count FROM ("
+    "SELECT GROUPING({columns}) AS dga_facet_set, {columns}, "
+    "COUNT(*) AS dga_count, ROW_NUMBER() OVER (PARTITION BY "
+    "GROUPING({columns}) ORDER BY COUNT(*) DESC, {columns}) AS dga_rank "
+    "FROM ({rows}) dga_facet_rows GROUP BY GROUPING SETS ({sets})"
+    ") dga_facets WHERE dga_rank <= %s ORDER BY dga_facet_set, dga_rank",
+}
+
+# Aggregate functions of the aggregate API, by measure function.
+AGGREGATE_FUNCTIONS = {
+    "count": Count,
+    "sum": Sum,
+    "avg": Avg,
+    "min": Min,
+    "max": Max,
+    "countDistinct": partial(Count, distinct=True),
+}
+
+# Measures that need a numeric field, and the numeric field types.
+NUMERIC_AGGREGATES = {"sum", "avg"}
+NUMERIC_FIELD_TYPES = {
+    "AutoField",
+    "BigAutoField",
+    "BigIntegerField",
+    "DecimalField",
+    "DurationField",
+    "FloatField",
+    "IntegerField",
+    "PositiveBigIntegerField",
+    "PositiveIntegerField",
+    "PositiveSmallIntegerField",
+    "SmallAutoField",
+    "SmallIntegerField",
+}
+
+# Annotation carrying the COUNT(*) OVER () total on paginated fetches.
+WINDOW_TOTAL_FIELD = "dga_window_total"
+
+_missing_model_names_count = 0
+
+
+def build_model_registry():
+    """
+    Builds the model registry from the current state of the app registry.
+    Models of all apps are registered as 'app_label.model_name'.
+    Models of non default apps are also registered by their lowercase model
+    name and verbose name. The first app in INSTALLED_APPS wins on clashes.
+
+    return : dict of lookup keys to model classes
+    """
+    global MODEL_REGISTRY, _missing_model_names_count
+
+    registry = {}
+    for app_config in apps.get_app_configs():
+        is_default_app = DEFAULT_APPS.get(app_config.name, False)
+        for model in app_config.get_models():
+            model_meta = getattr(model, "_meta")
+            registry[f"{model_meta.app_label}.{model_meta.model_name}"] = model
+            if is_default_app:
+                continue
+            registry.setdefault(model_meta.model_name, model)
+            registry.setdefault(str(model_meta.verbose_name).lower(), model)
+
+    # info: swap the whole dict so readers never see a half built registry
+    MODEL_REGISTRY = registry
+    _missing_model_names_count = 0
+    return registry
+
+
+def clear_model_registry(*args, **kwargs):
+    """
+    Drops the model registry, it is rebuilt on next lookup.
+    Connected to `class_prepared` and `setting_changed` so that models
+    registered after startup are picked up.
+    """
+    if kwargs.get("setting") not in (None, "INSTALLED_APPS"):
+        return
+
+    global MODEL_REGISTRY, _missing_model_names_count
+
+    MODEL_REGISTRY = {}
+    _missing_model_names_count = 0
+    get_field_index.cache_clear()
+    get_save_field_preparers.cache_clear()
+    compile_filter_plan.cache_clear()
+    clear_schema_cache()
+
+
 def get_model_by_name(model_name):
     """
-    Fetches a model dynamically by searching through all installed apps.
-    The expected formats for model_name are: 'app_name.model_name' or
-    'model_name'.
+    Fetches a model dynamically from the model registry.
+    The expected formats for model_name are: 'app_name.model_name',
+    'model_name' or the model's verbose name.
     If the model is found, the function returns the model.
     If the model is not found, it raises an error.
 
     param : model_name
     return : model object/error
     """
-    if model_name.__contains__("."):
-        try:
-            model = apps.get_model(model_name)
-            if model:
-                return model
-        except LookupError:
-            raise_exception(error="Model not found", code="DGA-S013")
-    for app_config in apps.get_app_configs():
-        if not DEFAULT_APPS.get(app_config.name):
-            model = app_config.models.get(model_name.lower())
-            if model:
-                return model
-    raise_exception(error="Model not found", code="DGA-S012")
+    global _missing_model_names_count
+
+    registry = MODEL_REGISTRY or build_model_registry()
+
+    if "." in model_name:
+        app_label, _, name = model_name.partition(".")
+        key = f"{app_label}.{name.lower()}"
+        code = "DGA-S013"
+    else:
+        key = model_name.lower()
+        code = "DGA-S012"
+
+    model = registry.get(key)
+    if model:
+        return model
+
+    if key not in registry:
+        if _missing_model_names_count < MAX_MISSING_MODEL_NAMES:
+            registry[key] = None
+            _missing_model_names_count += 1
+    raise_exception(error="Model not found", code=code)
 
 
 def generate_token(user):
@@ -74,6 +311,13 @@ def generate_token(user):
     ]
 
 
+# Pydantic config of generated model schemas, part of the schema cache key.
+MODEL_SCHEMA_CONFIG = (
+    ("extra", "forbid"),  # Forbid extra fields
+    ("str_strip_whitespace", True),  # Remove white spaces from strings
+)
+
+
 def get_model_config_schema(model, fields=None):
     """
     Converts a Django ORM model into a Pydantic model object.
@@ -81,19 +325,45 @@ def get_model_config_schema(model, fields=None):
     The resulting Pydantic model includes fields with their corresponding
     types, `max_length`, `default` constraints (if applicable), and an
     indication of whether fields are required.
+    Generated models are cached, so each worker compiles a schema once.
 
     :param model: Django model class to convert into a Pydantic model.
     """
+    fields = tuple(fields) if fields else None
+    return _build_model_config_schema(model, fields, MODEL_SCHEMA_CONFIG)
+
+
+def schema_cache_info():
+    """
+    Returns hits, misses, maxsize and currsize of the model schema cache.
+    """
+    return _build_model_config_schema.cache_info()
+
+
+def clear_schema_cache():
+    """
+    Drops all cached model schemas.
+    """
+    _build_model_config_schema.cache_clear()
+    get_schema_list_adapter.cache_clear()
+
+
+@lru_cache(maxsize=schema_cache_size)
+def _build_model_config_schema(model, fields, config):
+    """
+    Builds the Pydantic model of `get_model_config_schema`.
+    Results are cached, keyed by (model, fields tuple, config items).
+    """
     model_fields: Dict[str, tuple] = {}
 
     # info: validates nested fields(foreign key fields for time being "__")
-    model_meta = getattr(model, "_meta", None)
+    index = get_field_index(model)
 
     if fields:
         fields = str_field_to_model_field(model, fields)
 
     if not fields:
-        fields = model_meta.fields
+        fields = [index.fields_by_name[fld] for fld in index.field_names]
 
     for field1 in fields:
         if field1.name == "id":
@@ -104,18 +374,15 @@ def get_model_config_schema(model, fields=None):
         is_optional = field1.null or field1.blank or field1.has_default()
         default_value = field1.get_default() if field1.has_default() else None
 
-        django_field_type = field1.get_internal_type()
-
-        # Retrieve the Pydantic type from the mapping
-        if not DJANGO_TO_PYDANTIC_TYPE_MAP.get(django_field_type):
+        # Retrieve the Pydantic type from the field index
+        mapped_type = index.pydantic_types.get(field1.name)
+        if not mapped_type:
             return error_response(
                 error=f"Field type mapping not found for: " f"{field1.name}",
                 code="DGA-S001",
             )
 
-        mapped_type = DJANGO_TO_PYDANTIC_TYPE_MAP.get(django_field_type)
-
-        if django_field_type == "ForeignKey":
+        if field1.get_internal_type() == "ForeignKey":
             related_model_pk_type = int  # Assuming int PK for related fields
             field_type = (
                 Optional[related_model_pk_type]
@@ -125,8 +392,9 @@ def get_model_config_schema(model, fields=None):
         else:
             field_type = Optional[mapped_type] if is_optional else mapped_type
 
-        # Assigning attribute `max_length` if they exist for the field
-        if hasattr(field1, "max_length"):
+        # Assigning attribute `max_length` if they exist for the field,
+        # UUIDField's max_length is for its char column, not the UUID value
+        if hasattr(field1, "max_length") and mapped_type is not UUID:
             field_constraints["max_length"] = field1.max_length
 
         model_fields[field1.name] = (
@@ -134,11 +402,7 @@ def get_model_config_schema(model, fields=None):
             Field(default=default_value, **field_constraints),
         )
 
-    config_dict = ConfigDict(
-        title=model.__name__,
-        extra="forbid",  # Forbid extra fields
-        str_strip_whitespace=True,  # Remove white spaces from strings
-    )
+    config_dict = ConfigDict(title=model.__name__, **dict(config))
 
     # Dynamically create a Pydantic model
     pydantic_model = create_model(
@@ -150,34 +414,6 @@ def get_model_config_schema(model, fields=None):
     return pydantic_model
 
 
-def check_field_value(model, field1, value):
-    """
-    Check if the user given field exists in the model.
-    Retrieve the field's properties (such as null, blank, max_length, default).
-    Verify if the field accepts null as a valid input.
-    Confirm that the value is suitable for insertion into the field.
-
-    param : model, fields, value
-    return : True/False
-    """
-    is_fields_exist(model, [field1])
-
-    model_fields = get_model_fields_with_properties(model, [field1])
-    field_properties = model_fields[field1]
-    if field_properties.get("null") and value[0] is None:
-        return True
-
-    model_meta = getattr(model, "_meta")
-    field_instance = model_meta.get_field(field1)
-
-    for value_i in value:
-        try:
-            field_instance.get_prep_value(value_i)
-        except (ValueError, ValidationError):
-            return False
-    return True
-
-
 def fetch_data(
     model,
     filters=None,
@@ -186,11 +422,28 @@ def fetch_data(
     page_size=None,
     sort=None,
     distinct=None,
+    pagination=None,
+    cursor=None,
+    count_mode=None,
+    count_cap=None,
+    filter_group=None,
+    search_rank=None,
+    distinct_on=None,
+    relations=None,
 ):
     """
     Fetches data from a dynamically retrieved model.
 
-    :param distinct:
+    :param relations: related records nested in every record
+    :param distinct_on: fields of DISTINCT ON, on backends supporting it
+    :param search_rank: orders the best matches of the 'search' filter first
+    :param filter_group: nested and/or/not filters, and-ed with filters
+
+    :param count_cap: rows counted at most by the 'capped' count mode
+    :param count_mode: 'exact' (default), 'capped', 'estimated' or 'none'
+    :param cursor: nextCursor of the previous page, cursor pagination only
+    :param pagination: 'offset' (default) or 'cursor'
+    :param distinct: True, False or None to apply it when needed
     :param sort:
     :param page_size:
     :param page_number:
@@ -198,160 +451,2020 @@ def fetch_data(
     :param filters: Dictionary of filters for the query
     :param fields1: List of fields to return
     """
-    # info: validate field names from payload against model fields
-    is_fields_exist(model, fields1)
+    queryset = get_fetch_queryset(model, filters, fields1, sort, filter_group)
+    if queryset is None:
+        return dict(total=0, data=[])
 
-    # sort field validation
-    if sort:
-        is_fields_exist(model, [sort.field])
+    if distinct_on:
+        if not connections[queryset.db].features.can_distinct_on_fields:
+            raise_exception(
+                error="Distinct on fields is not supported by the database",
+                code="DGA-S022",
+            )
+        is_fields_exist(model, distinct_on)
+    apply_distinct = is_distinct_needed(
+        model,
+        distinct,
+        get_field_paths(fields1, filters, sort, filter_group),
+    )
 
-    # Perform a query on the model
-    queryset = model.objects.all()
+    count_mode = count_mode or "exact"
+    count_cache_key = None
+    if count_mode == "exact" and count_cache_timeout:
+        count_cache_key = make_count_cache_key(
+            model,
+            filters,
+            fields1,
+            apply_distinct,
+            pagination,
+            filter_group,
+            distinct_on,
+        )
 
-    # Apply filters dynamically
-    if filters:
-        query_filters = apply_filters(model, filters)
-        if len(query_filters.children) < 1:
-            return dict(total=0, data=[])
-        queryset = queryset.filter(query_filters)
+    if pagination == "cursor":
+        return fetch_page_by_cursor(
+            model,
+            queryset,
+            fields1,
+            page_size,
+            sort,
+            cursor,
+            count_mode,
+            count_cap,
+            count_cache_key,
+            apply_distinct,
+        )
 
     # Select only specified fields
-    queryset = queryset.values(*fields1)
+    queryset = queryset.values(
+        *dict.fromkeys([*fields1, *get_level_paths(model, relations)])
+    )
 
     # Sorting
-    if sort:
-        sort_fields = []
-        prefix = "-" if sort.order_by == "desc" else ""
-        sort_fields.append(f"{prefix}{sort.field}")
-        queryset = queryset.order_by(*sort_fields)
+    queryset = sort_queryset(
+        queryset, sort, tiebreaker=bool(distinct_on) or not apply_distinct
+    )
+    if search_rank:
+        search_filters = list(filters or [])
+        if filter_group:
+            search_filters.extend(filter_group.get_filters())
+        # info: best matches first, then the requested sort
+        queryset = queryset.alias(
+            dga_search_rank=get_search_rank(model, search_filters)
+        ).order_by(F("dga_search_rank").desc(), *queryset.query.order_by)
 
     # Distinct
-    if distinct is not False:
+    if distinct_on:
+        # info: DISTINCT ON keeps the first record of each value, so the
+        # values lead the ordering
+        queryset = queryset.order_by(
+            *distinct_on, *queryset.query.order_by
+        ).distinct(*distinct_on)
+    elif apply_distinct:
         # Apply distinct to ensure no duplicates
         queryset = queryset.distinct()
+
+    if (
+        count_mode == "exact"
+        and page_number
+        and page_size
+        and not (apply_distinct or distinct_on)
+        and connections[queryset.db].features.supports_over_clause
+    ):
+        total_records = cache.get(count_cache_key) if count_cache_key else None
+        if total_records is None:
+            # info: page and total are read in a single round-trip
+            start_index = (page_number - 1) * page_size
+            data, total_records = fetch_page_with_total(
+                queryset, start_index, start_index + page_size
+            )
+            if count_cache_key:
+                cache.set(count_cache_key, total_records, count_cache_timeout)
+            if relations:
+                data = nest_relations(model, data, fields1, relations)
+            return dict(total=total_records, data=data)
+
     # Fetch the total count of the records (without pagination)
-    total_records = queryset.count()
+    result = count_records(queryset, count_mode, count_cap, count_cache_key)
 
     # pagination
     if page_number and page_size:
         # SQL-level pagination using slicing
         start_index = (page_number - 1) * page_size
         end_index = start_index + page_size
+        if count_mode == "none":
+            # info: one extra row tells if there is a next page
+            end_index += 1
         queryset = queryset[start_index:end_index]
 
-    return dict(total=total_records, data=list(queryset))
+    data = list(queryset)
+    if count_mode == "none" and page_size:
+        result["hasNext"] = len(data) > page_size
+        data = data[:page_size]
+    if relations:
+        data = nest_relations(model, data, fields1, relations)
 
+    return dict(total=result.pop("total"), data=data, **result)
 
-def apply_filters(model, filters):
+
+def make_count_cache_key(
+    model,
+    filters,
+    fields1,
+    distinct,
+    pagination,
+    filter_group=None,
+    distinct_on=None,
+):
     """
-    Apply dynamic filters using Q objects.
-    Raises error if 'filters.value' is not suitable for 'filters.name' field
-    type.
-    Supported operators are (eq, in, not, gt, like, ilike).
+    Returns the cache key of an exact count, made of the model and the
+    normalized filters, fields and distinct options.
 
-    param : model (Django model), filters (List of filter objects).
-    returns : String representation of Q object / ValueError.
+    param : model (Django model), filters (List of FetchFilter), fields1
+    (List of fields), distinct (applied or not), pagination, filter_group
+    (FetchFilterGroup), distinct_on (List of fields)
+    return : cache key string
     """
-    query1 = Q()
-    last_logical_operation = "and"
-    for filter_item in filters:
-        operator = filter_item.operator
-        field_name = filter_item.name
-        value = filter_item.value
-        operation = filter_item.operation
+    return make_filters_cache_key(
+        "count",
+        model,
+        filters,
+        filter_group,
+        # info: cursor pagination counts rows, offset pagination counts the
+        # (distinct) projected values
+        fields=None if pagination == "cursor" else sorted(fields1),
+        distinct=None if pagination == "cursor" else distinct is not False,
+        distinct_on=None if pagination == "cursor" else distinct_on,
+    )
 
-        if not check_field_value(model, field_name, value):
-            raise_exception(
-                error=f"Invalid data: {value} for {field_name}",
-                code="DGA-S002",
+
+def make_filters_cache_key(kind, model, filters, filter_group, **options):
+    """
+    Returns the cache key of a result computed from filters, made of the
+    model, the normalized filters and the options of the result.
+
+    param : kind ('count', 'facets'), model (Django model), filters (List of
+    FetchFilter), filter_group (FetchFilterGroup), options (JSON values)
+    return : cache key string
+    """
+    model_meta = getattr(model, "_meta")
+    normalized = {
+        "filters": [
+            (
+                filter_item.model_dump(mode="json")
+                if hasattr(filter_item, "model_dump")
+                else filter_item
             )
+            for filter_item in filters or []
+        ],
+        "filterGroup": (
+            filter_group.model_dump(mode="json") if filter_group else None
+        ),
+        **options,
+    }
+    digest = hashlib.sha256(
+        json.dumps(normalized, sort_keys=True, default=str).encode()
+    ).hexdigest()
+    return f"dga:{kind}:{model_meta.label_lower}:{digest}"
+
+
+def fetch_facets(
+    model, filters=None, facets=None, facet_size=10, filter_group=None
+):
+    """
+    Counts the records matching the filters per value of each facet field,
+    and returns the facet_size most frequent values of every field.
+    On PostgreSQL all the facets are counted by one GROUPING SETS query,
+    elsewhere by one grouped query per facet. The counts are cached for
+    COUNT_CACHE_TIMEOUT seconds if it is set.
+
+    param : model (Django model), filters (List of FetchFilter), facets (List
+    of fields), facet_size, filter_group (FetchFilterGroup)
+    return : dict of facet field to list of {"value", "count"} dicts
+    """
+    queryset = get_fetch_queryset(model, filters, facets, None, filter_group)
+    if queryset is None:
+        return {facet: [] for facet in facets}
+
+    cache_key = None
+    if count_cache_timeout:
+        cache_key = make_filters_cache_key(
+            "facets",
+            model,
+            filters,
+            filter_group,
+            facets=facets,
+            facet_size=facet_size,
+        )
+        result = cache.get(cache_key)
+        if result is not None:
+            return result
 
-        condition1 = None
-
-        if operator == "eq":
-            condition1 = Q(**{f"{field_name}__exact": value[0]})
-        elif operator == "in":
-            condition1 = Q(**{f"{field_name}__in": value})
-        elif operator == "not":
-            condition1 = ~Q(**{f"{field_name}": value[0]})
-        elif operator == "gt":
-            condition1 = Q(**{f"{field_name}__gt": value[0]})
-        elif operator == "like":
-            condition1 = Q(**{f"{field_name}__contains": value[0]})
-        elif operator == "ilike":
-            condition1 = Q(**{f"{field_name}__icontains": value[0]})
+    queryset = queryset.order_by()
+    grouping_sets_sql = FACET_GROUPING_SETS_SQL.get(
+        connections[queryset.db].vendor
+    )
+    if grouping_sets_sql and len(facets) > 1:
+        result = fetch_facets_by_grouping_sets(
+            queryset, facets, facet_size, grouping_sets_sql
+        )
+    else:
+        # info: namespaced aliases, as 'value' or 'count' can be fields of
+        # the model
+        result = {
+            facet: [
+                dict(
+                    value=row["dga_facet_value"], count=row["dga_facet_count"]
+                )
+                for row in queryset.values(dga_facet_value=F(facet))
+                .annotate(dga_facet_count=Count("*"))
+                .order_by("-dga_facet_count", "dga_facet_value")[:facet_size]
+            ]
+            for facet in facets
+        }
 
-        if last_logical_operation == "or":
-            query1 |= condition1
-        else:
-            query1 &= condition1
-        last_logical_operation = operation.value
+    if cache_key:
+        cache.set(cache_key, result, count_cache_timeout)
+    return result
 
-    return query1
 
+def fetch_facets_by_grouping_sets(
+    queryset, facets, facet_size, grouping_sets_sql
+):
+    """
+    Counts the values of all the facet fields in a single GROUPING SETS
+    query, ranked per facet so only the facet_size most frequent values of
+    every field are returned.
 
-def handle_save_input(model, record_id, save_input):
+    param : queryset (filtered records), facets (List of fields),
+    facet_size, grouping_sets_sql (see FACET_GROUPING_SETS_SQL)
+    return : dict of facet field to list of {"value", "count"} dicts
     """
-    Create or Update a record.
-    Gets a json schema of model configuration.
-    Returns Error if record_id exists when length of save_input is greater
-    than 1.
-    Returns Error if non-existing fields are passed.
-    Fills with defaults value for a field when value is not given and
-    null=True.
-    Returns Error if value is not suitable to insert/update in a field type.
-    Returns Error if non-existing record id is passed.
-    When save_input is correct:
-        - Updates the record if record_id is passed.
-        - Creates a new record if record_id is null.
+    columns = [f"dga_facet_{index}" for index in range(len(facets))]
+    rows_sql, params = queryset.values(
+        **{column: F(facet) for column, facet in zip(columns, facets)}
+    ).query.sql_with_params()
+    quoted = ", ".join(f'"{column}"' for column in columns)
+    sql = grouping_sets_sql.format(
+        rows=rows_sql,
+        columns=quoted,
+        sets=", ".join(f'("{column}")' for column in columns),
+    )
 
-    param : model (Django model), record_id (null/integer), save_input (List
-    of dict).
-    return : Success message / Error message.
+    # info: GROUPING() has a bit set for every column outside the grouping
+    # set, the first column being the highest bit
+    all_bits = (1 << len(facets)) - 1
+    facet_by_set = {
+        all_bits ^ (1 << (len(facets) - 1 - index)): (index, facet)
+        for index, facet in enumerate(facets)
+    }
+    result = {facet: [] for facet in facets}
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(sql, [*params, facet_size])
+        for grouping_set, *values, count in cursor.fetchall():
+            index, facet = facet_by_set[grouping_set]
+            result[facet].append(dict(value=values[index], count=count))
+    return result
+
+
+def get_model_version(model):
     """
+    Returns the change version of a model, bumped whenever its records are
+    saved or deleted.
 
-    model_schema_pydantic_model = get_model_config_schema(model)
+    param : model (Django model)
+    return : version number
+    """
+    key = f"dga:version:{getattr(model, '_meta').label_lower}"
+    version = cache.get(key)
+    if version is None:
+        # info: start from the clock, so a version evicted from the cache
+        # never repeats an older one
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
 
-    instances = []
-    messages = []
 
-    if record_id and len(save_input) > 1:
-        raise_exception(
-            error="Only 1 record to update at once", code="DGA-S003"
+def bump_model_version(model):
+    """
+    Bumps the change version of a model, so the cached fetch results of the
+    model are no longer used.
+
+    param : model (Django model)
+    return : None
+    """
+    key = f"dga:version:{getattr(model, '_meta').label_lower}"
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, time.time_ns(), None)
+
+
+def bump_model_version_on_change(sender, using=None, **kwargs):
+    """
+    post_save / post_delete receiver, bumps the version of the changed model
+    once the transaction is committed.
+    """
+    transaction.on_commit(lambda: bump_model_version(sender), using=using)
+
+
+def get_fetch_models(model, field_paths):
+    """
+    Returns the models whose records a fetch reads, the model itself and the
+    related models of 'fk__field' paths.
+
+    param : model (Django model), field_paths (List of field paths)
+    return : List of models, sorted by label
+    """
+    field_index = get_field_index(model)
+    models = {model}
+    for path in field_paths:
+        if "__" in path:
+            related_model = field_index.fk_targets.get(path.split("__")[0])
+            if related_model is not None:
+                models.add(related_model)
+    return sorted(models, key=lambda item: getattr(item, "_meta").label)
+
+
+def make_fetch_digest(model, payload):
+    """
+    Returns the digest of a fetch, made of the normalized payload and the
+    change versions of the fetched models. It changes whenever the response
+    may change, and is read without querying the database.
+
+    param : model (Django model), payload (FetchPayload)
+    return : hex digest string
+    """
+    normalized = payload.model_dump(mode="json", exclude={"modelName"})
+    filters = payload.get_filters()
+    field_paths = list(payload.fields) + [
+        filter_item.name for filter_item in filters
+    ]
+    field_paths.extend(key.field for key in get_sort_keys(payload.sort))
+    field_paths.extend(payload.facets or [])
+    field_paths.extend(payload.distinctOn or [])
+    fetch_models = set(get_fetch_models(model, field_paths))
+    fetch_models.update(get_relation_models(model, payload.relations))
+    for filter_item in filters:
+        if filter_item.operator == "inQuery":
+            in_query = filter_item.value[0]
+            fetch_models.update(
+                get_fetch_models(
+                    get_model_by_name(in_query.modelName),
+                    [in_query.field]
+                    + [item.name for item in in_query.filters or []],
+                )
+            )
+    versions = sorted(
+        (
+            getattr(fetch_model, "_meta").label_lower,
+            get_model_version(fetch_model),
         )
+        for fetch_model in fetch_models
+    )
+    return hashlib.sha256(
+        json.dumps(
+            [normalized, versions], sort_keys=True, default=str
+        ).encode()
+    ).hexdigest()
 
-    for saveInput in save_input:
 
-        # Validate against schema
-        try:
-            model_schema_pydantic_model(**saveInput)
+def make_fetch_cache_key(model, digest, permission):
+    """
+    Returns the cache key of a fetch response, made of the fetch digest and
+    the permission the caller was checked for.
 
-        except Exception as e:
-            error_msg = e.errors()[0].get("msg")
-            error_loc = e.errors()[0].get("loc")
+    param : model (Django model), digest (see make_fetch_digest), permission
+    (string)
+    return : cache key string
+    """
+    return f"dga:fetch:{getattr(model, '_meta').label_lower}:{permission}:{digest}"
 
-            raise_exception(error=f"{error_msg}. {error_loc}", code="DGA-S004")
 
-        for field_name, value in list(saveInput.items()):
-            model_meta = getattr(model, "_meta", None)
-            model_field = model_meta.get_field(field_name)
+def get_or_set_fetch_result(cache_key, fetch_result):
+    """
+    Returns the cached bytes of a fetch response, or computes and caches them
+    for RESULT_CACHE_TIMEOUT seconds.
+    Only one caller computes a missing result, others wait for it for at most
+    FETCH_LOCK_TIMEOUT seconds before computing it themselves. A waiter
+    takes the lock when it is released without a result, as when its
+    holder failed.
+
+    param : cache_key, fetch_result (callable returning bytes)
+    return : bytes
+    """
+    content = cache.get(cache_key)
+    if content is not None:
+        return content
+
+    lock_key = f"{cache_key}:lock"
+    deadline = time.monotonic() + FETCH_LOCK_TIMEOUT
+    while not cache.add(lock_key, 1, FETCH_LOCK_TIMEOUT):
+        if time.monotonic() >= deadline:
+            return fetch_result()
+        time.sleep(FETCH_LOCK_POLL_INTERVAL)
+        content = cache.get(cache_key)
+        if content is not None:
+            return content
 
-            if (
-                model_field.has_default()
-                and not value
-                and value is not False
-                and not model_field.null
-            ):
-                saveInput.pop(field_name)
+    try:
+        content = fetch_result()
+        cache.set(cache_key, content, result_cache_timeout)
+        return content
+    finally:
+        cache.delete(lock_key)
 
-            try:
-                model_field.get_prep_value(value)
-            except Exception as e:
-                raise_exception(error=e, code="DGA-S005")
 
-            if isinstance(model_field, ForeignKey):
-                saveInput[model_field.attname] = saveInput.pop(field_name)
+def estimate_count(queryset):
+    """
+    Returns the planner's row estimate of a queryset, on backends exposing
+    it (PostgreSQL). Returns None on other backends.
+
+    param : queryset
+    return : int / None
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def get_fetch_queryset(
+    model, filters=None, fields1=None, sort=None, filter_group=None
+):
+    """
+    Validates the requested fields and sort fields, and filters the records
+    of the model.
+
+    param : model (Django model), filters (List of FetchFilter), fields1
+    (List of fields), sort (FetchSort or List of FetchSort), filter_group
+    (FetchFilterGroup)
+    return : queryset, None when the filters can match no record
+    """
+    # info: validate field names from payload against model fields
+    is_fields_exist(model, fields1)
+
+    # sort field validation, 'fk__field' paths included
+    is_fields_exist(model, [key.field for key in get_sort_keys(sort)])
+
+    # Perform a query on the model
+    queryset = model.objects.all()
+
+    # Apply filters dynamically
+    if filters:
+        query_filters = apply_filters(model, filters)
+        if len(query_filters.children) < 1:
+            return None
+        queryset = queryset.filter(query_filters)
+    if filter_group:
+        queryset = queryset.filter(apply_filter_group(model, filter_group))
+    return queryset
+
+
+def get_field_paths(fields1, filters=None, sort=None, filter_group=None):
+    """
+    Returns the field paths a fetch reads, its fields and the fields of its
+    filters and sort.
+
+    param : fields1 (List of fields), filters (List of FetchFilter), sort
+    (FetchSort or List of FetchSort), filter_group (FetchFilterGroup)
+    return : List of field paths
+    """
+    field_paths = list(fields1 or [])
+    field_paths.extend(filter_item.name for filter_item in filters or [])
+    if filter_group:
+        field_paths.extend(
+            filter_item.name for filter_item in filter_group.get_filters()
+        )
+    field_paths.extend(key.field for key in get_sort_keys(sort))
+    return field_paths
+
+
+def is_distinct_needed(model, distinct, field_paths):
+    """
+    Tells if a fetch is made DISTINCT. It is when asked for, and by default
+    only when a field path crosses a reverse foreign key or a many-to-many
+    relation, whose joins can repeat the records.
+
+    param : model (Django model), distinct (True, False or None), field_paths
+    return : bool
+    """
+    if distinct is not None:
+        return distinct
+    for path in field_paths:
+        # info: every segment is checked, a to-many relation can follow a
+        # foreign key, as in 'fk__reverse_fk'
+        path_model = model
+        for name in path.split("__"):
+            field1 = get_field_index(path_model).lookup_fields.get(name)
+            if field1 is None or not field1.is_relation:
+                break
+            if field1.one_to_many or field1.many_to_many:
+                return True
+            path_model = field1.related_model
+    return False
+
+
+def get_sort_keys(sort):
+    """
+    Returns the keys of a sort given as one key or a list of keys.
+
+    param : sort (FetchSort, List of FetchSort or None)
+    return : List of FetchSort
+    """
+    if not sort:
+        return []
+    return sort if isinstance(sort, list) else [sort]
+
+
+def get_sort_ordering(sort, pk_name=None):
+    """
+    Returns the ORDER BY expressions of the sort keys, with their NULLS
+    FIRST / LAST option. The primary key is appended as tiebreaker when
+    pk_name is given, so the order is deterministic and an index on the
+    sort fields and the pk can serve ORDER BY + LIMIT.
+
+    param : sort (FetchSort or List of FetchSort), pk_name
+    return : List of order expressions
+    """
+    ordering = []
+    sort_keys = get_sort_keys(sort)
+    for key in sort_keys:
+        nulls = {}
+        if key.nulls:
+            nulls[f"nulls_{key.nulls.value}"] = True
+        if key.order_by == "desc":
+            ordering.append(F(key.field).desc(**nulls))
+        else:
+            ordering.append(F(key.field).asc(**nulls))
+    if pk_name and sort_keys:
+        if not {pk_name, "pk"} & {key.field for key in sort_keys}:
+            ordering.append(F(pk_name).asc())
+    return ordering
+
+
+def sort_queryset(queryset, sort=None, tiebreaker=True):
+    """
+    Orders the queryset by the requested sort keys, then by the pk.
+
+    param : queryset, sort (FetchSort or List of FetchSort), tiebreaker
+    (False on DISTINCT querysets, where the pk would be selected)
+    return : queryset
+    """
+    if sort:
+        pk_name = getattr(queryset.model, "_meta").pk.name
+        queryset = queryset.order_by(
+            *get_sort_ordering(sort, pk_name if tiebreaker else None)
+        )
+    return queryset
+
+
+def get_relation(model, name):
+    """
+    Returns the relation field of a model, forward, reverse or
+    many-to-many.
+
+    param : model (Django model), name (relation name)
+    return : relation field
+    """
+    field1 = get_field_index(model).lookup_fields.get(name)
+    if field1 is None or not field1.is_relation or not field1.related_model:
+        raise_exception(error=f"Invalid relation {name}", code="DGA-S023")
+    return field1
+
+
+def is_joined_relation(field1):
+    """
+    Tells if a relation points at one record through a column of the model,
+    so it is read with a join instead of a separate query.
+    """
+    return field1.concrete and (field1.many_to_one or field1.one_to_one)
+
+
+def get_relation_models(model, relations):
+    """
+    Returns the models read by nested relations, at every level.
+
+    param : model (Django model), relations (List of FetchRelation)
+    return : List of models
+    """
+    models = []
+    for relation in relations or []:
+        related_model = get_relation(model, relation.name).related_model
+        models.append(related_model)
+        models.extend(get_relation_models(related_model, relation.relations))
+    return models
+
+
+def get_level_paths(model, relations, prefix=""):
+    """
+    Returns the value paths a level reads for its relations: the fields of
+    the joined relations, and the pk the other relations are queried by.
+
+    param : model (Django model), relations (List of FetchRelation), prefix
+    (path of the joined relation the level belongs to)
+    return : List of field paths
+    """
+    paths = []
+    for relation in relations or []:
+        field1 = get_relation(model, relation.name)
+        related_model = field1.related_model
+        is_fields_exist(related_model, relation.fields)
+        if is_joined_relation(field1):
+            sub_prefix = f"{prefix}{relation.name}__"
+            paths.extend(f"{sub_prefix}{name}" for name in relation.fields)
+            paths.append(f"{sub_prefix}pk")
+            paths.extend(
+                get_level_paths(related_model, relation.relations, sub_prefix)
+            )
+        else:
+            paths.append(f"{prefix}pk")
+    return list(dict.fromkeys(paths))
+
+
+def fetch_related_rows(field1, relation, keys):
+    """
+    Reads the records of a to-many or reverse relation for all parent keys
+    in one IN query, at most `limit` records per parent. The rows carry the
+    parent key as 'dga_parent'.
+
+    param : field1 (relation field), relation (FetchRelation), keys (parent
+    pks)
+    return : dict of parent pk to List of rows
+    """
+    related_model = field1.related_model
+    if field1.auto_created and not field1.concrete:
+        back = field1.field.name
+    else:
+        back = field1.related_query_name()
+    pk_name = getattr(related_model, "_meta").pk.name
+    if relation.sort:
+        is_fields_exist(related_model, [key.field for key in relation.sort])
+    ordering = get_sort_ordering(relation.sort, pk_name) or [F(pk_name).asc()]
+    limit = relation.limit or nested_max_children
+
+    db_alias = router.db_for_read(related_model)
+    conditions = {f"{back}__pk__in": keys}
+    if connections[db_alias].features.supports_over_clause:
+        # info: the fan-out is bounded in the database, per parent. The
+        # window is filtered in a pk subquery, the rows of the records it
+        # keeps are then capped per parent below.
+        conditions["pk__in"] = (
+            related_model.objects.filter(**conditions)
+            .annotate(
+                dga_position=Window(
+                    expression=RowNumber(),
+                    partition_by=[F(f"{back}__pk")],
+                    order_by=ordering,
+                )
+            )
+            .filter(dga_position__lte=limit)
+            .values("pk")
+        )
+    queryset = related_model.objects.filter(**conditions).values(
+        *dict.fromkeys(
+            [
+                *relation.fields,
+                *get_level_paths(related_model, relation.relations),
+            ]
+        ),
+        dga_parent=F(f"{back}__pk"),
+    )
+    rows_by_parent = {}
+    for row in queryset.order_by(*ordering):
+        rows = rows_by_parent.setdefault(row.pop("dga_parent"), [])
+        if len(rows) < limit:
+            rows.append(row)
+    return rows_by_parent
+
+
+def attach_relations(model, pairs, relations, prefix=""):
+    """
+    Adds the nested relations to the records of a level. Joined relations
+    are built from the row of their record, the other relations from one
+    query per relation for the whole level.
+
+    param : model (Django model), pairs (List of (record, row)), relations
+    (List of FetchRelation), prefix (path of the joined relation the level
+    belongs to)
+    """
+    for relation in relations or []:
+        field1 = get_relation(model, relation.name)
+        related_model = field1.related_model
+        if is_joined_relation(field1):
+            sub_prefix = f"{prefix}{relation.name}__"
+            child_pairs = []
+            for record, row in pairs:
+                if row[f"{sub_prefix}pk"] is None:
+                    record[relation.name] = None
+                    continue
+                child = {
+                    name: row[f"{sub_prefix}{name}"]
+                    for name in relation.fields
+                }
+                record[relation.name] = child
+                child_pairs.append((child, row))
+            attach_relations(
+                related_model, child_pairs, relation.relations, sub_prefix
+            )
+            continue
+
+        keys = {row[f"{prefix}pk"] for _, row in pairs}
+        keys.discard(None)
+        rows_by_parent = (
+            fetch_related_rows(field1, relation, keys) if keys else {}
+        )
+        child_pairs = []
+        for record, row in pairs:
+            children = []
+            for child_row in rows_by_parent.get(row[f"{prefix}pk"], []):
+                child = {name: child_row[name] for name in relation.fields}
+                children.append(child)
+                child_pairs.append((child, child_row))
+            if field1.one_to_one:
+                # info: reverse one-to-one, one record or None
+                record[relation.name] = children[0] if children else None
+            else:
+                record[relation.name] = children
+        attach_relations(related_model, child_pairs, relation.relations)
+
+
+def nest_relations(model, data, fields1, relations):
+    """
+    Returns the records of a page with their nested relations, the rows
+    being read with the paths of `get_level_paths`.
+
+    param : model (Django model), data (List of rows), fields1 (List of
+    fields), relations (List of FetchRelation)
+    return : List of records
+    """
+    pairs = [({name: row[name] for name in fields1}, row) for row in data]
+    attach_relations(model, pairs, relations)
+    return [record for record, _ in pairs]
+
+
+def export_data(
+    model,
+    filters=None,
+    fields1=None,
+    sort=None,
+    distinct=None,
+    export_format=None,
+    filter_group=None,
+):
+    """
+    Exports the records of a fetch as NDJSON or CSV lines.
+    Fields and filters are validated before returning, the records are then
+    read from a database cursor EXPORT_CHUNK_SIZE rows at a time while the
+    lines are consumed.
+
+    param : model (Django model), filters (List of FetchFilter), fields1
+    (List of fields), sort (FetchSort or List of FetchSort), distinct,
+    export_format ('ndjson' (default) or 'csv'), filter_group
+    (FetchFilterGroup)
+    return : iterator of encoded lines
+    """
+    queryset = get_fetch_queryset(model, filters, fields1, sort, filter_group)
+    if queryset is None:
+        queryset = model.objects.none()
+
+    apply_distinct = is_distinct_needed(
+        model, distinct, get_field_paths(fields1, filters, sort, filter_group)
+    )
+    queryset = sort_queryset(
+        queryset.values(*fields1), sort, tiebreaker=not apply_distinct
+    )
+    if apply_distinct:
+        queryset = queryset.distinct()
+
+    records = queryset.iterator(chunk_size=export_chunk_size)
+    if export_format == "csv":
+        return encode_csv_lines(records, fields1)
+    return encode_ndjson_lines(records)
+
+
+def encode_ndjson_lines(records):
+    """
+    Encodes records as newline delimited JSON.
+
+    param : records (iterable of dicts)
+    return : iterator of JSON lines
+    """
+    for record in records:
+        yield json.dumps(record, cls=PreciseJSONEncoder) + "\n"
+
+
+def encode_csv_lines(records, fields1):
+    """
+    Encodes records as CSV lines, starting with a header of the fields.
+
+    param : records (iterable of dicts), fields1 (List of fields)
+    return : iterator of CSV lines
+    """
+    writer = csv.writer(EchoBuffer())
+    yield writer.writerow(fields1)
+    for record in records:
+        yield writer.writerow([record[field] for field in fields1])
+
+
+def get_aggregate_annotations(model, measures):
+    """
+    Returns the aggregate expressions of the measures, by alias.
+    Raises error if a field does not exist, cannot be summed or averaged,
+    or if an alias is a field of the model.
+
+    param : model (Django model), measures (List of AggregateMeasure)
+    return : dict of alias to aggregate expression
+    """
+    field_index = get_field_index(model)
+    annotations = {}
+    for measure in measures:
+        function = measure.function.value
+        alias = measure.get_alias()
+        if alias in field_index.lookup_fields:
+            raise_exception(
+                error=f"Measure alias {alias} is a field of the model",
+                code="DGA-S021",
+            )
+        if measure.field:
+            is_fields_exist(model, [measure.field])
+            internal_type = field_index.resolve_path(
+                measure.field
+            ).get_internal_type()
+            if (
+                function in NUMERIC_AGGREGATES
+                and internal_type not in NUMERIC_FIELD_TYPES
+            ):
+                raise_exception(
+                    error=f"{function} is not supported for {measure.field}",
+                    code="DGA-S021",
+                )
+        annotations[alias] = AGGREGATE_FUNCTIONS[function](
+            measure.field or "*"
+        )
+    return annotations
+
+
+def aggregate_data(
+    model,
+    filters=None,
+    group_by=None,
+    measures=None,
+    page_number=1,
+    page_size=10,
+    sort=None,
+    filter_group=None,
+):
+    """
+    Aggregates the records of a model per group of the group-by fields, in
+    a single GROUP BY query paginated on the groups. Without group-by
+    fields, the totals of all the records are returned as one group.
+
+    param : model (Django model), filters (List of FetchFilter), group_by
+    (List of fields), measures (List of AggregateMeasure), page_number,
+    page_size, sort (FetchSort on a field or a measure alias), filter_group
+    (FetchFilterGroup)
+    return : dict of the total number of groups and the groups
+    """
+    queryset = get_fetch_queryset(model, filters, group_by, None, filter_group)
+    if queryset is None:
+        queryset = model.objects.none()
+    annotations = get_aggregate_annotations(model, measures)
+    if not group_by:
+        return dict(total=1, data=[queryset.aggregate(**annotations)])
+
+    queryset = queryset.values(*group_by).annotate(**annotations)
+    # info: the groups are paginated, so their order must be stable
+    queryset = queryset.order_by(*get_sort_ordering(sort), *group_by)
+
+    start_index = (page_number - 1) * page_size
+    end_index = start_index + page_size
+    if connections[queryset.db].features.supports_over_clause:
+        # info: the window counts the groups, read with the page
+        data, total_groups = fetch_page_with_total(
+            queryset, start_index, end_index
+        )
+    else:
+        total_groups = queryset.count()
+        data = list(queryset[start_index:end_index])
+    return dict(total=total_groups, data=data)
+
+
+def fetch_page_with_total(queryset, start_index, end_index):
+    """
+    Fetches a page of records together with the total count of the
+    queryset, using a COUNT(*) OVER () window annotation. The window is
+    evaluated before LIMIT/OFFSET, so every row carries the full total.
+    A separate count is only run when the page is empty.
+
+    Must not be used on a DISTINCT queryset, as the window counts the rows
+    before duplicates are removed.
+
+    param : queryset (values queryset), start_index, end_index
+    return : (list of records, total count)
+    """
+    data = list(
+        queryset.annotate(
+            **{WINDOW_TOTAL_FIELD: Window(expression=Count("*"))}
+        )[start_index:end_index]
+    )
+    if data:
+        total_records = data[0][WINDOW_TOTAL_FIELD]
+        for record in data:
+            del record[WINDOW_TOTAL_FIELD]
+    elif start_index == 0:
+        total_records = 0
+    else:
+        # info: page beyond the last record, the window has no row to report
+        total_records = queryset.count()
+    return data, total_records
+
+
+def count_records(
+    queryset, count_mode="exact", count_cap=None, cache_key=None
+):
+    """
+    Counts the records of a fetch with the requested strategy:
+        - exact: COUNT of all records, cached for COUNT_CACHE_TIMEOUT
+          seconds when cache_key is given.
+        - capped: COUNT of at most count_cap records, using a LIMITed
+          subquery. 'totalCapped' tells if there are more records.
+        - estimated: planner estimate where the backend exposes it, exact
+          count otherwise. 'totalEstimated' tells which one was used.
+        - none: no count, the caller reports 'hasNext' instead.
+
+    param : queryset, count_mode, count_cap (null/int), cache_key
+    (null/string)
+    return : dict with total and the count mode specific keys
+    """
+    if count_mode == "none":
+        return dict(total=None)
+
+    if count_mode == "capped":
+        count_cap = count_cap or default_count_cap
+        total_records = queryset[: count_cap + 1].count()
+        return dict(
+            total=min(total_records, count_cap),
+            totalCapped=total_records > count_cap,
+        )
+
+    if count_mode == "estimated":
+        total_records = estimate_count(queryset)
+        if total_records is not None:
+            return dict(total=total_records, totalEstimated=True)
+
+    if cache_key:
+        total_records = cache.get(cache_key)
+        if total_records is None:
+            total_records = queryset.count()
+            cache.set(cache_key, total_records, count_cache_timeout)
+    else:
+        total_records = queryset.count()
+
+    if count_mode == "estimated":
+        return dict(total=total_records, totalEstimated=False)
+    return dict(total=total_records)
+
+
+def encode_cursor(sort_key, values):
+    """
+    Encodes the sort key and the last row's sort values into an opaque
+    cursor string.
+
+    param : sort_key (List [field, order]), values (List of values)
+    return : cursor string
+    """
+    data = json.dumps({"k": sort_key, "v": values}, cls=PreciseJSONEncoder)
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor, sort_key, sort_fields):
+    """
+    Decodes a cursor made by `encode_cursor`.
+    Returns Error if the cursor is malformed or was made for another sort.
+
+    param : cursor (string), sort_key (List [field, order]), sort_fields
+    (List of field instances matching the cursor values)
+    return : List of values
+    """
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(cursor + padding))
+        if data["k"] != sort_key or len(data["v"]) != len(sort_fields):
+            raise ValueError("Cursor does not match the sort")
+        return [
+            None if value is None else field1.to_python(value)
+            for field1, value in zip(sort_fields, data["v"])
+        ]
+    except Exception:
+        raise_exception(error="Invalid cursor", code="DGA-S018")
+
+
+def get_keyset_condition(sort_field, pk_name, descending, last_value, last_pk):
+    """
+    Returns the Q object seeking past the last row of the previous page,
+    the equivalent of `WHERE (sort, pk) > (last_value, last_pk)`.
+    NULL sort values are ordered first in ascending and last in descending
+    order.
+
+    param : sort_field, pk_name, descending (bool), last_value, last_pk
+    return : Q object
+    """
+    after = "lt" if descending else "gt"
+    after_pk = Q(**{f"{pk_name}__{after}": last_pk})
+    if sort_field == pk_name:
+        return after_pk
+
+    if last_value is None:
+        condition = Q(**{f"{sort_field}__isnull": True}) & after_pk
+        if not descending:
+            condition |= Q(**{f"{sort_field}__isnull": False})
+        return condition
+
+    condition = Q(**{f"{sort_field}__{after}": last_value}) | (
+        Q(**{sort_field: last_value}) & after_pk
+    )
+    if descending:
+        condition |= Q(**{f"{sort_field}__isnull": True})
+    return condition
+
+
+def fetch_page_by_cursor(
+    model,
+    queryset,
+    fields1,
+    page_size,
+    sort,
+    cursor,
+    count_mode="exact",
+    count_cap=None,
+    count_cache_key=None,
+    distinct=False,
+):
+    """
+    Fetches one page with keyset (cursor) pagination.
+    Rows are ordered by the sort field with the primary key as tiebreaker,
+    the next page seeks past the last row instead of using OFFSET, so every
+    page costs the same.
+
+    param : model (Django model), queryset (filtered queryset), fields1
+    (List of fields), page_size, sort (FetchSort/None), cursor (null/string),
+    count_mode, count_cap, count_cache_key (see `count_records`), distinct
+    (removes the rows repeated by to-many joins)
+    return : dict with total, data and nextCursor
+    """
+    index = get_field_index(model)
+    pk_field = getattr(model, "_meta").pk
+    pk_name = pk_field.name
+
+    # info: cursor pagination sorts by one key, see FetchPayload
+    sort = sort[0] if isinstance(sort, list) else sort
+    sort_field = sort.field if sort else pk_name
+    descending = bool(sort) and sort.order_by == "desc"
+    sort_key = [sort_field, "desc" if descending else "asc"]
+
+    # info: sort field and pk are needed to build the next cursor
+    extra_fields = [fld for fld in {sort_field, pk_name} if fld not in fields1]
+    if distinct:
+        # info: the pk is selected, so DISTINCT keeps one row per record and
+        # values, and the keyset seek stays exact
+        queryset = queryset.values(*fields1, *extra_fields).distinct()
+
+    # Fetch the total count of the records (without pagination)
+    result = count_records(queryset, count_mode, count_cap, count_cache_key)
+
+    if cursor:
+        last_value, last_pk = decode_cursor(
+            cursor, sort_key, [index.resolve_path(sort_field), pk_field]
+        )
+        queryset = queryset.filter(
+            get_keyset_condition(
+                sort_field, pk_name, descending, last_value, last_pk
+            )
+        )
+
+    if sort_field == pk_name:
+        ordering = [F(pk_name).desc() if descending else F(pk_name).asc()]
+    elif descending:
+        ordering = [F(sort_field).desc(nulls_last=True), F(pk_name).desc()]
+    else:
+        ordering = [F(sort_field).asc(nulls_first=True), F(pk_name).asc()]
+
+    rows = list(
+        queryset.values(*fields1, *extra_fields).order_by(*ordering)[
+            : page_size + 1
+        ]
+    )
+
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = encode_cursor(
+            sort_key, [rows[-1][sort_field], rows[-1][pk_name]]
+        )
+
+    for row in rows:
+        for fld in extra_fields:
+            row.pop(fld)
+
+    if count_mode == "none":
+        result["hasNext"] = next_cursor is not None
+
+    return dict(
+        total=result.pop("total"), data=rows, nextCursor=next_cursor, **result
+    )
+
+
+def get_filter_shape(filters):
+    """
+    Returns the shape of a filter list: the operators, field names and
+    logical operations, without the values.
+
+    param : filters (List of filter objects)
+    return : tuple of (operator, name, operation) tuples
+    """
+    return tuple(
+        (
+            getattr(filter_item.operator, "value", filter_item.operator),
+            filter_item.name,
+            getattr(filter_item.operation, "value", filter_item.operation),
+        )
+        for filter_item in filters
+    )
+
+
+def _make_filter_value_checker(field_instance):
+    """
+    Builds the closure that tells if filter values are suitable for a field.
+    """
+    # info: reverse relations have no prep value of their own
+    get_prep_value = getattr(field_instance, "get_prep_value", None)
+    nullable = field_instance.null
+
+    def check(value):
+        if nullable and value[0] is None:
+            return True
+        if get_prep_value is None:
+            return True
+        for value_i in value:
+            try:
+                get_prep_value(value_i)
+            except (ValueError, ValidationError):
+                return False
+        return True
+
+    return check
+
+
+def _accept_filter_value(value):
+    return True
+
+
+def _skip_large_in_check(check_value):
+    """
+    Wraps a value checker so it only checks lists up to LARGE_IN_THRESHOLD.
+    """
+
+    def check(value):
+        return len(value) > large_in_threshold or check_value(value)
+
+    return check
+
+
+def _make_condition_builder(field_name, operator):
+    """
+    Builds the closure that makes the Q object of one filter from its values.
+    """
+    lookup, multiple_values, negated = FILTER_LOOKUPS[operator]
+    key = f"{field_name}__{lookup}"
+
+    def build(value):
+        condition1 = Q((key, value if multiple_values else value[0]))
+        return ~condition1 if negated else condition1
+
+    return build
+
+
+def _make_in_condition_builder(model, field_name, field_instance, connection):
+    """
+    Builds the closure that makes the Q object of an 'in' filter.
+    Lists longer than LARGE_IN_THRESHOLD are sent as one JSON array parameter
+    expanded into rows by the database, so the query text does not grow with
+    the list and the parameter limit of the backend is not hit. Their values
+    are converted and validated in one pass.
+    The closure is cached with the plan, so it looks up the connection of
+    the calling thread instead of keeping `connection`.
+    """
+    key = f"{field_name}__in"
+    rows_sql = JSON_ARRAY_ROWS_SQL[connection.vendor].format(
+        db_type=field_instance.rel_db_type(connection)
+    )
+    get_db_prep_value = field_instance.get_db_prep_value
+
+    def build(value):
+        if len(value) <= large_in_threshold:
+            return Q((key, value))
+        connection = connections[router.db_for_read(model)]
+        try:
+            db_values = [
+                get_db_prep_value(value_i, connection) for value_i in value
+            ]
+        except (ValueError, TypeError, ValidationError):
+            raise_exception(
+                error=f"Invalid data: {value} for {field_name}",
+                code="DGA-S002",
+            )
+        return Q(
+            (
+                key,
+                RawSQL(
+                    rows_sql, [json.dumps(db_values, cls=PreciseJSONEncoder)]
+                ),
+            )
+        )
+
+    return build
+
+
+def _make_in_query_condition_builder(field_name):
+    """
+    Builds the closure that makes the Q object of an 'inQuery' filter, a
+    semi-join on the records of another model run by the database as a
+    subquery.
+    """
+    key = f"{field_name}__in"
+
+    def build(value):
+        in_query = value[0]
+        in_query_model = get_model_by_name(in_query.modelName)
+        queryset = get_fetch_queryset(
+            in_query_model, in_query.filters, [in_query.field]
+        )
+        if queryset is None:
+            queryset = in_query_model.objects.none()
+        return Q((key, Subquery(queryset.values(in_query.field))))
+
+    return build
+
+
+def get_search_sql(model, field_name, statement, connection):
+    """
+    Returns the full-text search SQL of a model field for a database.
+    Raises error if the field or the database does not support search.
+
+    param : model (Django model), field_name, statement ('create',
+    'refresh', 'drop', 'filter' or 'rank'), connection
+    return : SQL string, or list of SQL strings
+    """
+    model_meta = getattr(model, "_meta")
+    vendor_sql = SEARCH_SQL.get(connection.vendor)
+    field_instance = get_field_index(model).fields_by_name.get(field_name)
+    if (
+        vendor_sql is None
+        or field_instance is None
+        or field_instance.get_internal_type() not in SEARCH_FIELD_TYPES
+        # info: FTS5 tables are keyed by integer row ids
+        or not model_meta.pk.get_internal_type().endswith(
+            ("AutoField", "IntegerField")
+        )
+    ):
+        raise_exception(
+            error=f"Search is not supported for {field_name}",
+            code="DGA-S019",
+        )
+
+    names = dict(
+        index=truncate_name(
+            f"dga_search_{model_meta.db_table}_{field_instance.column}",
+            connection.ops.max_name_length(),
+        ),
+        table=model_meta.db_table,
+        column=field_instance.column,
+        pk=model_meta.pk.column,
+        config=search_config,
+    )
+    sql = vendor_sql[statement]
+    if isinstance(sql, list):
+        return [item.format(**names) for item in sql]
+    return sql.format(**names)
+
+
+def is_search_index_missing(model, field_name, connection):
+    """
+    Tells if the search filter of a field needs an index that was not built.
+
+    param : model (Django model), field_name, connection
+    return : bool
+    """
+    if "exists" not in SEARCH_SQL[connection.vendor]:
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(get_search_sql(model, field_name, "exists", connection))
+        return cursor.fetchone() is None
+
+
+def prepare_search_query(value, connection):
+    """
+    Returns the search query parameter of a search text.
+
+    param : value (search text), connection
+    return : query string
+    """
+    if connection.vendor == "sqlite":
+        # info: every word is quoted, so the text is never read as FTS5
+        # query syntax
+        return " ".join(
+            '"{}"'.format(word.replace('"', '""')) for word in value.split()
+        )
+    return value
+
+
+def build_search_index(model, field_name, drop=False):
+    """
+    Creates the search index of a model field if it is missing and refreshes
+    its content, or drops it.
+    On SQLite the index is an FTS5 table kept in sync by triggers, on
+    PostgreSQL a GIN index on the field's text search vector.
+
+    param : model (Django model), field_name, drop (bool)
+    return : None
+    """
+    connection = connections[router.db_for_write(model)]
+    if drop:
+        statements = get_search_sql(model, field_name, "drop", connection)
+    else:
+        statements = get_search_sql(
+            model, field_name, "create", connection
+        ) + get_search_sql(model, field_name, "refresh", connection)
+    with transaction.atomic(using=connection.alias):
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+
+
+def _make_search_condition_builder(model, field_name, connection):
+    """
+    Builds the closure that makes the Q object of a 'search' filter.
+    The index is checked on every call, as other processes can build or
+    drop it while the plan is cached. Like the plan, the closure is shared
+    by threads, so it looks up the connection of the calling thread.
+    """
+    filter_sql = get_search_sql(model, field_name, "filter", connection)
+
+    def build(value):
+        connection = connections[router.db_for_read(model)]
+        if is_search_index_missing(model, field_name, connection):
+            raise_exception(
+                error=f"Search index of {field_name} is not built",
+                code="DGA-S020",
+            )
+        return Q(
+            pk__in=RawSQL(
+                filter_sql, [prepare_search_query(value[0], connection)]
+            )
+        )
+
+    return build
+
+
+def get_search_rank(model, filters):
+    """
+    Returns the rank expression of the first 'search' filter, higher for
+    better matches.
+
+    param : model (Django model), filters (List of filter objects)
+    return : expression / None without search filter
+    """
+    connection = connections[router.db_for_read(model)]
+    for filter_item in filters:
+        if filter_item.operator == "search":
+            return RawSQL(
+                get_search_sql(model, filter_item.name, "rank", connection),
+                [prepare_search_query(filter_item.value[0], connection)],
+                output_field=FloatField(),
+            )
+    return None
+
+
+def get_in_query_models(filters):
+    """
+    Returns the models read by the 'inQuery' filters, their 'view'
+    permission must be checked like the fetched model's.
+
+    param : filters (List of filter objects)
+    return : List of models / ValueError if a model does not exist
+    """
+    return [
+        get_model_by_name(filter_item.value[0].modelName)
+        for filter_item in filters
+        if filter_item.operator == "inQuery"
+    ]
+
+
+@lru_cache(maxsize=filter_plan_cache_size)
+def compile_filter_plan(model, shape):
+    """
+    Compiles a filter shape into a cached plan, so the field lookups and
+    validation of repeated shapes run once.
+    Raises error if a field name does not exist.
+
+    param : model (Django model), shape (see get_filter_shape)
+    return : tuple of (value checker, condition builder, operation) tuples
+    """
+    field_index = get_field_index(model)
+    connection = connections[router.db_for_read(model)]
+    plan = []
+    for operator, field_name, operation in shape:
+        is_fields_exist(model, [field_name])
+        field_instance = field_index.resolve_path(field_name)
+        if operator == "search":
+            # info: the search text is validated by the payload
+            plan.append(
+                (
+                    _accept_filter_value,
+                    _make_search_condition_builder(
+                        model, field_name, connection
+                    ),
+                    operation,
+                )
+            )
+            continue
+
+        if operator == "inQuery":
+            # info: the nested fetch is validated while building it
+            plan.append(
+                (
+                    _accept_filter_value,
+                    _make_in_query_condition_builder(field_name),
+                    operation,
+                )
+            )
+            continue
+
+        build_condition = _make_condition_builder(field_name, operator)
+        if operator == "isnull":
+            # info: the value is a boolean, validated by the payload
+            check_value = _accept_filter_value
+        else:
+            check_value = _make_filter_value_checker(field_instance)
+
+        if (
+            operator == "in"
+            and connection.vendor in JSON_ARRAY_ROWS_SQL
+            and hasattr(field_instance, "get_db_prep_value")
+        ):
+            # info: large lists are validated while building the condition
+            check_value = _skip_large_in_check(check_value)
+            build_condition = _make_in_condition_builder(
+                model, field_name, field_instance, connection
+            )
+        plan.append((check_value, build_condition, operation))
+    return tuple(plan)
+
+
+def apply_filters(model, filters):
+    """
+    Apply dynamic filters using Q objects.
+    Raises error if 'filters.value' is not suitable for 'filters.name' field
+    type.
+    Supported operators are (eq, in, not, gt, gte, lt, lte, range, like,
+    ilike, startswith, istartswith, endswith, isnull, inQuery, search).
+
+    param : model (Django model), filters (List of filter objects).
+    returns : String representation of Q object / ValueError.
+    """
+    query1 = Q()
+    last_logical_operation = "and"
+    for condition1, operation in build_filter_conditions(model, filters):
+        if last_logical_operation == "or":
+            query1 |= condition1
+        else:
+            query1 &= condition1
+        last_logical_operation = operation
+
+    return query1
+
+
+def build_filter_conditions(model, filters):
+    """
+    Validates the filter values with the compiled plan of the filters shape
+    and builds their Q objects.
+
+    param : model (Django model), filters (List of filter objects).
+    returns : List of (Q object, operation) / ValueError.
+    """
+    plan = compile_filter_plan(model, get_filter_shape(filters))
+
+    conditions = []
+    for filter_item, (check_value, build_condition, operation) in zip(
+        filters, plan
+    ):
+        value = filter_item.value
+        if not check_value(value):
+            raise_exception(
+                error=f"Invalid data: {value} for {filter_item.name}",
+                code="DGA-S002",
+            )
+        conditions.append((build_condition(value), operation))
+    return conditions
+
+
+def apply_filter_group(model, filter_group):
+    """
+    Compiles nested and/or/not filter groups into one Q object tree.
+    The filters of all levels share one compiled plan.
+
+    param : model (Django model), filter_group (FetchFilterGroup).
+    returns : Q object / ValueError.
+    """
+    conditions = iter(
+        build_filter_conditions(model, filter_group.get_filters())
+    )
+
+    def build_group(group):
+        children = [next(conditions)[0] for _ in group.filters or []]
+        children.extend(build_group(child) for child in group.groups or [])
+
+        query1 = Q()
+        for condition1 in children:
+            if group.operation == "or":
+                query1 |= condition1
+            else:
+                query1 &= condition1
+        return ~query1 if group.operation == "not" else query1
+
+    return build_group(filter_group)
+
+
+@lru_cache(maxsize=schema_cache_size)
+def get_schema_list_adapter(schema):
+    """
+    Returns a compiled `TypeAdapter` validating a list of `schema` records.
+
+    param : Pydantic model
+    return : TypeAdapter
+    """
+    return TypeAdapter(List[schema])
+
+
+def _make_field_preparer(field1):
+    """
+    Builds the closure that prepares one validated save input value.
+    The closure returns the key to save the value under, or None when the
+    value is empty and the field default should be used instead.
+    It raises if the value is not suitable for the field.
+    """
+    use_default = field1.has_default() and not field1.null
+    get_prep_value = field1.get_prep_value
+    key = field1.attname if isinstance(field1, ForeignKey) else field1.name
+
+    def prepare(value):
+        if use_default and not value and value is not False:
+            return None
+        get_prep_value(value)
+        return key
+
+    return prepare
+
+
+@lru_cache(maxsize=None)
+def get_save_field_preparers(model):
+    """
+    Returns the cached field name to preparer closure mapping of a model.
+
+    param : model (Django model)
+    return : dict
+    """
+    index = get_field_index(model)
+    return MappingProxyType(
+        {
+            name: _make_field_preparer(field1)
+            for name, field1 in index.fields_by_name.items()
+        }
+    )
+
+
+def format_row_errors(e, save_input):
+    """
+    Formats a list validation error as '<msg>. <loc>'.
+    Single record input returns one message, multiple records return the
+    first error of every failing record prefixed by its index.
+
+    param : ValidationError, save_input (List of dict)
+    return : string / list of strings
+    """
+    row_errors = {}
+    for error in e.errors():
+        error_msg = error.get("msg")
+        error_loc = error.get("loc")
+
+        # info: error on the input itself, ex: saveInput is not a list
+        if not error_loc or not isinstance(error_loc[0], int):
+            return f"{error_msg}. {error_loc}"
+
+        row_errors.setdefault(error_loc[0], f"{error_msg}. {error_loc[1:]}")
+
+    if len(save_input) == 1:
+        return row_errors[0]
+    return [f"Record {index}: {msg}" for index, msg in row_errors.items()]
+
+
+def is_bulk_create_supported(model):
+    """
+    Tells if `bulk_create` can insert the records of a model, which it
+    cannot for multi-table inherited models.
+
+    param : model (Django model)
+    return : bool
+    """
+    model_meta = getattr(model, "_meta")
+    return all(
+        getattr(parent, "_meta").concrete_model is model_meta.concrete_model
+        for parent in model_meta.get_parent_list()
+    )
+
+
+def bulk_create_records(model, save_input):
+    """
+    Creates all records in a single transaction.
+    Uses `bulk_create` on backends returning primary keys from bulk inserts,
+    Django splits the rows into chunks the backend accepts. Other backends,
+    and multi-table inherited models, insert the records one by one inside
+    the same transaction.
+
+    param : model (Django model), save_input (List of prepared dict).
+    return : List of created instances / Error message.
+    """
+    db_alias = router.db_for_write(model)
+    features = connections[db_alias].features
+    instances = [model(**saveInput) for saveInput in save_input]
+    try:
+        with transaction.atomic(using=db_alias):
+            if (
+                features.can_return_rows_from_bulk_insert
+                and is_bulk_create_supported(model)
+            ):
+                instances = model.objects.using(db_alias).bulk_create(
+                    instances, batch_size=bulk_create_batch_size
+                )
+            else:
+                for instance in instances:
+                    instance.save(force_insert=True, using=db_alias)
+    except Exception as e:
+        raise_exception(error=e.args[0], code="DGA-S007")
+    return instances
+
+
+def is_batch_update(save_input):
+    """
+    Checks if save_input is a batch update, every record has an "id".
+    Returns Error if only some of the records have an "id".
+
+    param : save_input (List of dict)
+    return : True / False / Error
+    """
+    if not isinstance(save_input, list) or not save_input:
+        return False
+
+    with_id = [
+        isinstance(saveInput, dict) and "id" in saveInput
+        for saveInput in save_input
+    ]
+    if all(with_id):
+        return True
+    if any(with_id):
+        raise_exception(
+            error="Either all or none of the records must have an 'id'",
+            code="DGA-S014",
+        )
+    return False
+
+
+def bulk_update_records(model, record_ids, save_input):
+    """
+    Updates several records in a single transaction.
+    Existence of all records is checked with one SELECT, changes are
+    written with `bulk_update`.
+
+    param : model (Django model), record_ids (List of ids), save_input (List
+    of prepared dict).
+    return : List of updated instances / Error message.
+    """
+    pk_field = getattr(model, "_meta").pk
+    try:
+        record_ids = [pk_field.get_prep_value(pk) for pk in record_ids]
+    except Exception as e:
+        raise_exception(error=e.args[0], code="DGA-S007")
+
+    if len(set(record_ids)) != len(record_ids):
+        raise_exception(
+            error="Same record (ID) is passed more than once",
+            code="DGA-S015",
+        )
+
+    db_alias = router.db_for_write(model)
+    update_fields = set()
+    missing_ids = []
+    try:
+        with transaction.atomic(using=db_alias):
+            existing = (
+                model.objects.using(db_alias)
+                .select_for_update()
+                .in_bulk(record_ids)
+            )
+            missing_ids = [pk for pk in record_ids if pk not in existing]
+            if missing_ids:
+                raise model.DoesNotExist()
+
+            instances = []
+            for pk, saveInput in zip(record_ids, save_input):
+                instance = existing[pk]
+                for field1, value in saveInput.items():
+                    setattr(instance, field1, value)
+                    update_fields.add(field1)
+                instances.append(instance)
+
+            if update_fields:
+                model.objects.using(db_alias).bulk_update(
+                    instances,
+                    fields=sorted(update_fields),
+                    batch_size=bulk_create_batch_size,
+                )
+    except model.DoesNotExist:
+        raise_exception(
+            error=f"Record with (ID) {missing_ids} does not exist",
+            code="DGA-S006",
+        )
+    except Exception as e:
+        raise_exception(error=e.args[0], code="DGA-S007")
+    return instances
+
+
+def get_upsert_fields(model, upsert):
+    """
+    Validates the upsert field names against the model's unique
+    constraints.
+    Returns Error if the fields do not exist or are not exactly the fields of
+    a unique field, `unique_together` or unique constraint.
+
+    param : model (Django model), upsert (List of field names)
+    return : List of field instances / Error message.
+    """
+    index = get_field_index(model)
+    model_meta = getattr(model, "_meta")
+
+    unique_fields = []
+    for name in upsert:
+        field1 = index.fields_by_name.get(name) or index.fields_by_attname.get(
+            name
+        )
+        if field1 is None:
+            raise_exception(
+                error=f"Upsert field {name} not in the model", code="DGA-S016"
+            )
+        unique_fields.append(field1)
+
+    unique_sets = [{fld.name} for fld in model_meta.fields if fld.unique]
+    unique_sets += [set(fields) for fields in model_meta.unique_together]
+    unique_sets += [
+        set(constraint.fields)
+        for constraint in model_meta.total_unique_constraints
+    ]
+    if {fld.name for fld in unique_fields} not in unique_sets:
+        raise_exception(
+            error=f"Upsert fields {upsert} are not unique together",
+            code="DGA-S016",
+        )
+    return unique_fields
+
+
+def _get_unique_key(obj, unique_fields):
+    """
+    Returns the normalized values of the unique fields of an instance.
+    """
+    return tuple(
+        fld.to_python(getattr(obj, fld.attname)) for fld in unique_fields
+    )
+
+
+def _get_records_by_unique_keys(model, db_alias, unique_fields, keys):
+    """
+    Returns existing records of the given unique keys as {key: instance}.
+    Only primary key and unique fields are loaded.
+    """
+    attnames = [fld.attname for fld in unique_fields]
+    if len(unique_fields) == 1:
+        query = Q(**{f"{attnames[0]}__in": [key[0] for key in keys]})
+    else:
+        query = Q()
+        for key in keys:
+            query |= Q(**dict(zip(attnames, key)))
+
+    pk_attname = getattr(model, "_meta").pk.attname
+    queryset = (
+        model.objects.using(db_alias).filter(query).only(pk_attname, *attnames)
+    )
+    return {_get_unique_key(obj, unique_fields): obj for obj in queryset}
+
+
+def upsert_records(model, unique_fields, save_input):
+    """
+    Creates or updates records matched by their unique fields in a single
+    transaction.
+    Records with the same set of fields are written together with
+    `bulk_create(update_conflicts=True)`, one statement per chunk. Backends
+    without `ON CONFLICT (...)` support read the existing records with one
+    SELECT and use `bulk_update` and `bulk_create` instead, multi-table
+    inherited models insert their new records one by one.
+
+    param : model (Django model), unique_fields (List of field instances),
+    save_input (List of prepared dict).
+    return : List of saved instances / Error message.
+    """
+    db_alias = router.db_for_write(model)
+    features = connections[db_alias].features
+    manager = model.objects.using(db_alias)
+    bulk_create_supported = is_bulk_create_supported(model)
+
+    instances = [model(**saveInput) for saveInput in save_input]
+    keys = [_get_unique_key(obj, unique_fields) for obj in instances]
+    if len(set(keys)) != len(keys):
+        raise_exception(
+            error="Same record is passed more than once", code="DGA-S015"
+        )
+
+    # info: group records by the fields they set, so a record never
+    # overwrites fields it did not send
+    unique_names = {fld.name for fld in unique_fields}
+    unique_names |= {fld.attname for fld in unique_fields}
+    groups = {}
+    for obj, key, saveInput in zip(instances, keys, save_input):
+        update_fields = tuple(sorted(set(saveInput) - unique_names))
+        groups.setdefault(update_fields, []).append((obj, key))
+
+    try:
+        with transaction.atomic(using=db_alias):
+            for update_fields, group in groups.items():
+                group_instances = [obj for obj, _ in group]
+                if (
+                    features.supports_update_conflicts_with_target
+                    and bulk_create_supported
+                ):
+                    manager.bulk_create(
+                        group_instances,
+                        batch_size=bulk_create_batch_size,
+                        update_conflicts=bool(update_fields),
+                        ignore_conflicts=not update_fields,
+                        unique_fields=(
+                            [fld.name for fld in unique_fields]
+                            if update_fields
+                            else None
+                        ),
+                        update_fields=list(update_fields) or None,
+                    )
+                    continue
+
+                existing = _get_records_by_unique_keys(
+                    model, db_alias, unique_fields, [key for _, key in group]
+                )
+                to_create, to_update = [], []
+                for obj, key in group:
+                    current = existing.get(key)
+                    if current is None:
+                        to_create.append(obj)
+                        continue
+                    for field1 in update_fields:
+                        setattr(current, field1, getattr(obj, field1))
+                    obj.pk = current.pk
+                    to_update.append(current)
+                if to_update and update_fields:
+                    manager.bulk_update(
+                        to_update,
+                        fields=list(update_fields),
+                        batch_size=bulk_create_batch_size,
+                    )
+                if to_create and bulk_create_supported:
+                    manager.bulk_create(
+                        to_create, batch_size=bulk_create_batch_size
+                    )
+                else:
+                    for obj in to_create:
+                        obj.save(force_insert=True, using=db_alias)
+
+            # info: read back primary keys the backend did not return
+            missing = [
+                (obj, key)
+                for obj, key in zip(instances, keys)
+                if obj.pk is None
+            ]
+            if missing:
+                existing = _get_records_by_unique_keys(
+                    model, db_alias, unique_fields, [key for _, key in missing]
+                )
+                for obj, key in missing:
+                    obj.pk = existing[key].pk
+    except Exception as e:
+        raise_exception(error=e.args[0], code="DGA-S007")
+    return instances
+
+
+def handle_save_input(model, record_id, save_input, upsert=None):
+    """
+    Create or Update a record.
+    Gets a json schema of model configuration.
+    Returns Error if record_id exists when length of save_input is greater
+    than 1.
+    Returns Error if non-existing fields are passed.
+    All records are validated together, errors of every failing record are
+    returned with the record index.
+    Fills with defaults value for a field when value is not given and
+    null=True.
+    Returns Error if value is not suitable to insert/update in a field type.
+    Returns Error if non-existing record id is passed.
+    When save_input is correct:
+        - Updates the record if record_id is passed.
+        - Creates a new record if record_id is null.
+        - Creates all records in one transaction with `bulk_create` if
+          record_id is null and save_input has more than 1 record.
+        - Updates all records in one transaction with `bulk_update` if
+          record_id is null and every record of save_input has an "id".
+        - Creates or updates records matched by the `upsert` unique fields.
+
+    param : model (Django model), record_id (null/integer), save_input (List
+    of dict), upsert (null/List of unique field names).
+    return : Success message / Error message.
+    """
+
+    model_schema_pydantic_model = get_model_config_schema(model)
+
+    instances = []
+    messages = []
+
+    if record_id and len(save_input) > 1:
+        raise_exception(
+            error="Only 1 record to update at once", code="DGA-S003"
+        )
+
+    unique_fields = None
+    if upsert:
+        if record_id or is_batch_update(save_input):
+            raise_exception(
+                error="Upsert can not be used with 'id'", code="DGA-S017"
+            )
+        unique_fields = get_upsert_fields(model, upsert)
+
+    # info: records carrying their own "id" are updated as one batch
+    record_ids = None
+    if not record_id and is_batch_update(save_input):
+        record_ids = [saveInput["id"] for saveInput in save_input]
+        save_input = [
+            {key: value for key, value in saveInput.items() if key != "id"}
+            for saveInput in save_input
+        ]
+
+    # Validate all records against schema in one pydantic-core call
+    try:
+        get_schema_list_adapter(model_schema_pydantic_model).validate_python(
+            save_input
+        )
+    except PydanticValidationError as e:
+        raise_exception(
+            error=format_row_errors(e, save_input), code="DGA-S004"
+        )
+
+    field_preparers = get_save_field_preparers(model)
+    prepared_input = []
+    for saveInput in save_input:
+        prepared_row = {}
+        for field_name, value in saveInput.items():
+            try:
+                key = field_preparers[field_name](value)
+            except Exception as e:
+                raise_exception(error=e, code="DGA-S005")
+            if key is not None:
+                prepared_row[key] = value
+        prepared_input.append(prepared_row)
+
+    if unique_fields:
+        instances = upsert_records(model, unique_fields, prepared_input)
+        return instances, ["Record saved successfully."]
+
+    if record_ids is not None:
+        instances = bulk_update_records(model, record_ids, prepared_input)
+        return instances, ["Record updated successfully."]
+
+    if not record_id and len(prepared_input) > 1:
+        instances = bulk_create_records(model, prepared_input)
+        return instances, ["Record created successfully."]
 
+    for saveInput in prepared_input:
         try:
             if record_id:
                 # Fetch the instance if record_id is provided
@@ -5,7 +5,10 @@ from rest_framework_simplejwt.views import (
 )
 
 from .views import (
+    GenericAggregateAPIView,
+    GenericBatchAPIView,
     GenericFetchAPIView,
+    GenericExportAPIView,
     GenericSaveAPIView,
     LogoutAPIView,
     GenericLoginAPIView,
@@ -20,6 +23,13 @@ from .views import (
 urlpatterns = [
     path("v1/fetch/", GenericFetchAPIView.as_view(), name="generic-fetch"),
     path("v1/save/", GenericSaveAPIView.as_view(), name="generic-save"),
+    path("v1/export/", GenericExportAPIView.as_view(), name="generic-export"),
+    path(
+        "v1/aggregate/",
+        GenericAggregateAPIView.as_view(),
+        name="generic-aggregate",
+    ),
+    path("v1/batch/", GenericBatchAPIView.as_view(), name="generic-batch"),
     path("v1/logout/", LogoutAPIView.as_view(), name="logout"),
     path("v1/login/", GenericLoginAPIView.as_view(), name="login"),
     path("v1/register/", GenericRegisterAPIView.as_view(), name="register"),
@@ -6,13 +6,18 @@ import os
 import random
 import string
 import time
+from dataclasses import dataclass
 from decimal import Decimal
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, List
+from types import MappingProxyType
+from typing import Any, List, Mapping, Tuple
 from uuid import UUID
 
 from django.conf import settings
 from django.core.exceptions import FieldDoesNotExist
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.http import parse_etags
 from pydantic import (
     ConfigDict,
     EmailStr,
@@ -87,6 +92,42 @@ class PydanticConfigV1:
     )
 
 
+class PreciseJSONEncoder(DjangoJSONEncoder):
+    """
+    JSON encoder keeping the microseconds of datetimes and times, which
+    DjangoJSONEncoder cuts to milliseconds.
+    """
+
+    def default(self, o):
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+class EchoBuffer:
+    """
+    File-like object returning what is written, so csv.writer can encode
+    lines for a streaming response.
+    """
+
+    def write(self, value):
+        return value
+
+
+def is_etag_matched(etag, if_none_match):
+    """
+    Tells if an If-None-Match header matches the ETag, using the weak
+    comparison of RFC 9110.
+
+    param : etag (quoted string), if_none_match (header value)
+    return : bool
+    """
+    for client_etag in parse_etags(if_none_match):
+        if client_etag == "*" or client_etag.removeprefix("W/") == etag:
+            return True
+    return False
+
+
 def make_permission_str(model, action):
     """
     Returns a permission string.
@@ -101,6 +142,121 @@ def make_permission_str(model, action):
     return permission
 
 
+@dataclass(frozen=True)
+class FieldIndex:
+    """
+    Immutable, per-model lookup tables of field metadata.
+    Built once per model by `get_field_index` and shared by all validators.
+    """
+
+    model: type
+    # info: concrete field names in model definition order
+    field_names: Tuple[str, ...]
+    fields_by_name: Mapping[str, Any]
+    fields_by_attname: Mapping[str, Any]
+    fields_by_verbose_name: Mapping[str, Any]
+    # info: every name accepted by `_meta.get_field` (names, attnames and
+    # reverse relations)
+    lookup_fields: Mapping[str, Any]
+    positions: Mapping[str, int]
+    properties: Mapping[str, Mapping[str, Any]]
+    # info: fields whose default is a callable, evaluated on every read
+    callable_defaults: frozenset
+    # info: relation name to related model (forward and reverse relations)
+    fk_targets: Mapping[str, type]
+    pydantic_types: Mapping[str, Any]
+
+    def get_field(self, name):
+        """
+        Same lookup as `_meta.get_field`, served from the index.
+
+        param : field name or attname
+        return : field instance / FieldDoesNotExist
+        """
+        try:
+            return self.lookup_fields[name]
+        except KeyError:
+            raise FieldDoesNotExist(
+                f"{self.model.__name__} has no field named '{name}'"
+            )
+
+    def resolve_path(self, path):
+        """
+        Resolves a 'field' or 'fk__field' path to the field instance it
+        points at.
+
+        param : field path (string)
+        return : field instance / FieldDoesNotExist
+        """
+        if "__" not in path:
+            return self.get_field(path)
+        fk_field, related_field = path.split("__", 1)
+        related_model = self.fk_targets.get(fk_field)
+        if related_model is None:
+            raise FieldDoesNotExist(
+                f"{self.model.__name__} has no relation named '{fk_field}'"
+            )
+        return get_field_index(related_model).get_field(related_field)
+
+
+@lru_cache(maxsize=None)
+def get_field_index(model):
+    """
+    Returns the cached `FieldIndex` of a model.
+    The cache is cleared when the app registry changes.
+
+    param : model (Django model)
+    return : FieldIndex
+    """
+    model_meta = getattr(model, "_meta")
+
+    fields_by_name = {}
+    fields_by_attname = {}
+    fields_by_verbose_name = {}
+    positions = {}
+    properties = {}
+    callable_defaults = set()
+    pydantic_types = {}
+    for position, field1 in enumerate(model_meta.fields):
+        fields_by_name[field1.name] = field1
+        fields_by_attname[field1.attname] = field1
+        fields_by_verbose_name.setdefault(str(field1.verbose_name), field1)
+        positions[field1.name] = position
+        if callable(field1.default):
+            callable_defaults.add(field1.name)
+            field_properties = get_field_properties(field1, with_default=False)
+        else:
+            field_properties = get_field_properties(field1)
+        properties[field1.name] = MappingProxyType(field_properties)
+        pydantic_types[field1.name] = DJANGO_TO_PYDANTIC_TYPE_MAP.get(
+            field1.get_internal_type()
+        )
+
+    lookup_fields = {}
+    fk_targets = {}
+    for field1 in model_meta.get_fields():
+        lookup_fields[field1.name] = field1
+        attname = getattr(field1, "attname", None)
+        if attname:
+            lookup_fields.setdefault(attname, field1)
+        if field1.is_relation and field1.related_model:
+            fk_targets[field1.name] = field1.related_model
+
+    return FieldIndex(
+        model=model,
+        field_names=tuple(fields_by_name),
+        fields_by_name=MappingProxyType(fields_by_name),
+        fields_by_attname=MappingProxyType(fields_by_attname),
+        fields_by_verbose_name=MappingProxyType(fields_by_verbose_name),
+        lookup_fields=MappingProxyType(lookup_fields),
+        positions=MappingProxyType(positions),
+        properties=MappingProxyType(properties),
+        callable_defaults=frozenset(callable_defaults),
+        fk_targets=MappingProxyType(fk_targets),
+        pydantic_types=MappingProxyType(pydantic_types),
+    )
+
+
 def get_model_fields_with_properties(model, field_list=None):
     """
     Returns a dictionary where the keys are field names and the values are a
@@ -110,19 +266,25 @@ def get_model_fields_with_properties(model, field_list=None):
     :param model: Django model class
     :return: dict
     """
-    model_meta = getattr(model, "_meta")
+    index = get_field_index(model)
 
     if field_list:
         # info: read only user given fields in filters.name
-        fields = [model_meta.get_field(fld) for fld in field_list]
+        fields = [index.get_field(fld) for fld in field_list]
     else:
-        fields = model_meta.fields
+        fields = [index.fields_by_name[fld] for fld in index.field_names]
 
     field_dict = {}
 
     # info: Retrieve field properties of each field
     for field1 in fields:
-        field_properties = get_field_properties(field1)
+        field_properties = index.properties.get(field1.name)
+        if field_properties is None:
+            field_properties = get_field_properties(field1)
+        else:
+            field_properties = dict(field_properties)
+            if field1.name in index.callable_defaults:
+                field_properties["default"] = field1.get_default()
         field_dict[field1.name] = field_properties
 
     return field_dict
@@ -137,27 +299,22 @@ def is_fields_exist(model, fields):
     param : model (Django model), fields (List of fields).
     returns : True / Error.
     """
+    index = get_field_index(model)
 
     valid_fields = []
     for field in fields:
-        if not field.__contains__("__"):
+        if "__" not in field:
             valid_fields.append(field)
         else:
             # Validate if the fk field exists
-            fk_field, related_field = field.split("__", 1)
             try:
-                model_meta = getattr(model, "_meta")  # data of model
-                fk = model_meta.get_field(fk_field)  # data of fk field
-                # data of fk field model
-                related_model_meta = getattr(fk.related_model, "_meta")
-                related_model_meta.get_field(related_field)
+                index.resolve_path(field)
             except FieldDoesNotExist:
                 raise_exception(
                     error=f"Invalid foreign field {field}", code="DGA-U001"
                 )
 
-    model_fields = get_model_fields_with_properties(model)
-    result = set(valid_fields) - set(model_fields.keys())
+    result = set(valid_fields) - index.fields_by_name.keys()
     if len(result) > 0:
         raise_exception(error=f"Extra field {result}", code="DGA-U002")
     return True
@@ -256,12 +413,12 @@ def is_valid_email_domain(domain):
     return False
 
 
-def get_field_properties(field1):
+def get_field_properties(field1, with_default=True):
     """
     Retrieve field properties like 'type','null','blank',
     'max_length', 'default'
 
-    param : Django field instance
+    param : Django field instance, with_default (bool)
     return : dict with field properties
     """
     field_properties = {
@@ -271,7 +428,7 @@ def get_field_properties(field1):
     }
     if getattr(field1, "max_length", None):
         field_properties["max_length"] = getattr(field1, "max_length", None)
-    if getattr(field1, "default", None):
+    if with_default and getattr(field1, "default", None):
         field_properties["default"] = field1.get_default()
 
     return field_properties
@@ -342,27 +499,19 @@ def str_field_to_model_field(model, fields):
     param : model object, field (list)
     return : list of field objects
     """
-    model_meta = getattr(model, "_meta", None)
+    index = get_field_index(model)
 
     fld_set = set()
-    fld = []
-    c1, c2 = 0, len(fields)
-    for field in model_meta.fields:
-        field_name = field.attname
-        field_verbose_name = field.verbose_name
-        try:
-            if fields.__contains__(field_name):
-                fld_set.add(field_name)
-                fld.append(field)
-                c1 += 1
-            elif fields.__contains__(field_verbose_name):
-                fld_set.add(field_verbose_name)
-                fld.append(field)
-                c1 += 1
-        except:
-            continue
-        if c1 == c2:
-            break
+    fld = {}
+    for field in fields:
+        # info: a string may match a field by attname or by verbose name
+        for field1 in (
+            index.fields_by_attname.get(field),
+            index.fields_by_verbose_name.get(field),
+        ):
+            if field1 is not None:
+                fld_set.add(field)
+                fld[field1.name] = field1
     fld_diff = set(fields) - fld_set
     if len(fld_diff) > 0:
         fld_diff = ",".join(fld_diff)
@@ -370,7 +519,8 @@ def str_field_to_model_field(model, fields):
             error=f"'[{fld_diff}]'s not in the model.", code="DGA-U006"
         )
 
-    fields = fld
+    # info: keep the model definition order of fields
+    fields = sorted(fld.values(), key=lambda f: index.positions[f.name])
 
     return fields
 
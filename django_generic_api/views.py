@@ -1,5 +1,7 @@
 import base64
+import json
 import time
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import quote, unquote
 
 from captcha.helpers import captcha_image_url
@@ -9,12 +11,27 @@ from django.contrib.auth import get_user_model, logout, password_validation
 from django.core.cache import cache
 from django.core.exceptions import ValidationError as DjangoValidationError
 from django.core.mail import send_mail
+from django.db import connections, router, transaction
+from django.http import HttpResponse, StreamingHttpResponse
 from pydantic import ValidationError
 from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from .config import create_batch_size, expiry_hours
+from .config import (
+    batch_max_workers,
+    create_batch_size,
+    expiry_hours,
+    fetch_etag,
+    result_cache_timeout,
+)
 from .payload_models import (
+    BatchOperationEnum,
+    BatchPayload,
+    AggregatePayload,
+    ExportFormatEnum,
+    ExportPayload,
     FetchPayload,
     SavePayload,
     GenericLoginPayload,
@@ -24,14 +41,25 @@ from .payload_models import (
     GenericUserUpdatePayload,
 )
 from .services import (
+    aggregate_data,
+    bump_model_version,
+    get_in_query_models,
+    get_relation_models,
     get_model_by_name,
+    get_or_set_fetch_result,
     handle_save_input,
+    make_fetch_cache_key,
+    make_fetch_digest,
+    is_batch_update,
     fetch_data,
+    fetch_facets,
+    export_data,
     generate_token,
     handle_user_info_update,
     read_user_info,
 )
 from .utils import (
+    is_etag_matched,
     make_permission_str,
     registration_token,
     store_user_ip,
@@ -48,14 +76,23 @@ class GenericSaveAPIView(APIView):
     - Strict typing is enabled for payload.
     - Checks if model exists or not.
     - Checks if user has 'add' or 'change' permission.
-    - Save functionality.
+    - Save functionality, records with an "id" are updated as a batch.
+    - Upsert functionality, records are created or updated by unique fields.
 
     """
 
     def post(self, *args, **kwargs):
-
         payload = self.request.data.get("payload", {}).get("variables", {})
+        return self.run(self.request.user, payload)
+
+    def run(self, user, payload):
+        """
+        Saves the records of a save payload for the user, also used by the
+        batch API.
 
+        param : user, payload (dict of variables)
+        return : Response
+        """
         save_input = payload.get("saveInput", [])
 
         # Does not allow saving more than the customized number of records
@@ -79,6 +116,7 @@ class GenericSaveAPIView(APIView):
         model_name = validated_payload_data.modelName
         save_input = validated_payload_data.saveInput
         record_id = validated_payload_data.id
+        upsert = validated_payload_data.upsert
 
         try:
             model = get_model_by_name(model_name)
@@ -90,12 +128,29 @@ class GenericSaveAPIView(APIView):
                 http_status=e.args[0]["http_status"],
             )
 
+        try:
+            is_update = bool(record_id) or is_batch_update(save_input)
+        except Exception as e:
+            return error_response(
+                error=e.args[0]["error"], code=e.args[0]["code"]
+            )
+
         status_code = (
-            status.HTTP_201_CREATED if not record_id else status.HTTP_200_OK
+            status.HTTP_201_CREATED
+            if not (is_update or upsert)
+            else status.HTTP_200_OK
         )
-        action = "save" if not record_id else "edit"
+        # info: upsert may add and change records
+        if upsert:
+            permissions = [
+                make_permission_str(model, "save"),
+                make_permission_str(model, "edit"),
+            ]
+        else:
+            action = "save" if not is_update else "edit"
+            permissions = [make_permission_str(model, action)]
         # checks if user has permission to add or change the data
-        if not self.request.user.has_perm(make_permission_str(model, action)):
+        if not user.has_perms(permissions):
             return error_response(
                 error="Something went wrong!!! Please contact the "
                 "administrator.",
@@ -105,8 +160,16 @@ class GenericSaveAPIView(APIView):
 
         try:
             instances, message = handle_save_input(
-                model, record_id, save_input
+                model, record_id, save_input, upsert
             )
+            if result_cache_timeout or fetch_etag:
+                # info: bulk creates and updates send no post_save signal.
+                # The version changes once the records are committed, so a
+                # concurrent fetch cannot cache old rows under it.
+                transaction.on_commit(
+                    lambda: bump_model_version(model),
+                    using=router.db_for_write(model),
+                )
             instance_ids = [instance.id for instance in instances]
             return success_response(
                 data=[{"id": instance_ids}],
@@ -129,8 +192,22 @@ class GenericFetchAPIView(APIView):
     """
 
     def post(self, *args, **kwargs):
-
         payload = self.request.data.get("payload", {}).get("variables", {})
+        return self.run(
+            self.request.user,
+            payload,
+            self.request.headers.get("If-None-Match", ""),
+        )
+
+    def run(self, user, payload, if_none_match="", use_cache=True):
+        """
+        Fetches the records of a fetch payload for the user, also used by
+        the batch API.
+
+        param : user, payload (dict of variables), if_none_match (header),
+        use_cache (False while uncommitted saves are visible)
+        return : Response
+        """
         try:
             # Validate the payload using the Pydantic model
             validated_payload_data = FetchPayload(**payload)
@@ -150,10 +227,22 @@ class GenericFetchAPIView(APIView):
         page_size = validated_payload_data.pageSize
         sort = validated_payload_data.sort
         distinct = validated_payload_data.distinct
+        pagination = validated_payload_data.pagination
+        cursor = validated_payload_data.cursor
+        count_mode = validated_payload_data.countMode
+        count_cap = validated_payload_data.countCap
 
         # check if user has permission to view the data.
         try:
             model = get_model_by_name(model_name)
+            # info: models read by 'inQuery' filters need the same permission
+            in_query_models = get_in_query_models(
+                validated_payload_data.get_filters()
+            )
+            # info: and so do the models of nested relations
+            relation_models = get_relation_models(
+                model, validated_payload_data.relations
+            )
         except Exception as e:
             return error_response(
                 error=e.args[0]["error"],
@@ -161,15 +250,22 @@ class GenericFetchAPIView(APIView):
                 http_status=e.args[0]["http_status"],
             )
 
-        if not self.request.user.has_perm(make_permission_str(model, "fetch")):
+        permissions = sorted(
+            {
+                make_permission_str(fetch_model, "fetch")
+                for fetch_model in [model, *in_query_models, *relation_models]
+            }
+        )
+        if not user.has_perms(permissions):
             return error_response(
                 error="Something went wrong!!! Please contact the "
                 "administrator.",
                 code="DGA-V007",
                 http_status=status.HTTP_404_NOT_FOUND,
             )
-        try:
-            data = fetch_data(
+
+        def fetch():
+            result = fetch_data(
                 model,
                 filters,
                 fields,
@@ -177,14 +273,324 @@ class GenericFetchAPIView(APIView):
                 page_size,
                 sort,
                 distinct,
+                pagination,
+                cursor,
+                count_mode,
+                count_cap,
+                validated_payload_data.filterGroup,
+                validated_payload_data.searchRank,
+                validated_payload_data.distinctOn,
+                validated_payload_data.relations,
             )
-            return success_response(
-                data=data,
-                message="Completed.",
+            if validated_payload_data.facets:
+                result["facets"] = fetch_facets(
+                    model,
+                    filters,
+                    validated_payload_data.facets,
+                    validated_payload_data.facetSize,
+                    validated_payload_data.filterGroup,
+                )
+            return result
+
+        etag = None
+        if result_cache_timeout or fetch_etag:
+            # info: read before any query, so a change made while fetching
+            # gives a newer digest than the returned data
+            digest = make_fetch_digest(model, validated_payload_data)
+        if fetch_etag:
+            etag = f'"{digest}"'
+            if is_etag_matched(etag, if_none_match):
+                return Response(
+                    status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+                )
+
+        try:
+            if result_cache_timeout and use_cache:
+                # info: the rendered response is cached, so cache hits skip
+                # both the queries and the serialization
+                content = get_or_set_fetch_result(
+                    make_fetch_cache_key(model, digest, ",".join(permissions)),
+                    lambda: JSONRenderer().render(
+                        {"data": fetch(), "message": "Completed."}
+                    ),
+                )
+                response = HttpResponse(
+                    content, content_type="application/json"
+                )
+            else:
+                response = success_response(
+                    data=fetch(),
+                    message="Completed.",
+                )
+        except Exception as e:
+            return error_response(**e.args[0])
+
+        if etag:
+            response["ETag"] = etag
+        return response
+
+
+class GenericAggregateAPIView(APIView):
+    """
+    Aggregate API
+    - Strict typing is enabled for payload.
+    - Checks if model exists or not.
+    - Checks if user has 'view' permission.
+    - Aggregates the records per group in the database.
+    """
+
+    def post(self, *args, **kwargs):
+
+        payload = self.request.data.get("payload", {}).get("variables", {})
+        try:
+            validated_payload_data = AggregatePayload(**payload)
+        except ValidationError as e:
+            error_msg = e.errors()[0].get("msg")
+            error_loc = e.errors()[0].get("loc")
+            error = f"{error_msg}{error_loc}"
+
+            return error_response(error=error, code="DGA-V044")
+
+        try:
+            model = get_model_by_name(validated_payload_data.modelName)
+            in_query_models = get_in_query_models(
+                validated_payload_data.get_filters()
+            )
+        except Exception as e:
+            return error_response(
+                error=e.args[0]["error"],
+                code=e.args[0]["code"],
+                http_status=e.args[0]["http_status"],
+            )
+
+        permissions = sorted(
+            {
+                make_permission_str(aggregate_model, "fetch")
+                for aggregate_model in [model, *in_query_models]
+            }
+        )
+        if not self.request.user.has_perms(permissions):
+            return error_response(
+                error="Something went wrong!!! Please contact the "
+                "administrator.",
+                code="DGA-V045",
+                http_status=status.HTTP_404_NOT_FOUND,
+            )
+        try:
+            data = aggregate_data(
+                model,
+                validated_payload_data.filters,
+                validated_payload_data.fields,
+                validated_payload_data.measures,
+                validated_payload_data.pageNumber,
+                validated_payload_data.pageSize,
+                validated_payload_data.sort,
+                validated_payload_data.filterGroup,
             )
         except Exception as e:
             return error_response(**e.args[0])
 
+        return success_response(data=data, message="Completed.")
+
+
+class GenericBatchAPIView(APIView):
+    """
+    Batch API
+    - Strict typing is enabled for payload.
+    - Runs a list of fetch and save operations in order, authenticated once.
+    - Saves run in one transaction, with the fetches listed between them.
+    - Fetches listed before the first save or after the last one run
+      concurrently on a bounded thread pool.
+    - Results are returned in the order of the operations.
+    """
+
+    def post(self, *args, **kwargs):
+
+        payload = self.request.data.get("payload", {}).get("variables", {})
+        try:
+            validated_payload_data = BatchPayload(**payload)
+        except ValidationError as e:
+            error_msg = e.errors()[0].get("msg")
+            error_loc = e.errors()[0].get("loc")
+            error = f"{error_msg}{error_loc}"
+
+            return error_response(error=error, code="DGA-V046")
+
+        user = self.request.user
+        # info: loads the permissions once, for all the operations
+        user.get_all_permissions()
+        operations = validated_payload_data.operations
+        responses = [None] * len(operations)
+
+        saves = [
+            index
+            for index, operation in enumerate(operations)
+            if operation.type == BatchOperationEnum.SAVE
+        ]
+        fetches = [
+            index
+            for index, operation in enumerate(operations)
+            if operation.type == BatchOperationEnum.FETCH
+        ]
+        fetch_view = GenericFetchAPIView()
+
+        def fetch(index):
+            try:
+                return fetch_view.run(user, operations[index].variables)
+            finally:
+                # info: worker threads open their own database connections
+                connections.close_all()
+
+        def run_fetches(indices):
+            # info: in an atomic request the fetches must see its
+            # transaction, so they run in the request thread
+            if (
+                len(indices) > 1
+                and not transaction.get_connection().in_atomic_block
+            ):
+                with ThreadPoolExecutor(
+                    max_workers=min(batch_max_workers, len(indices))
+                ) as executor:
+                    for index, response in zip(
+                        indices, executor.map(fetch, indices)
+                    ):
+                        responses[index] = response
+            else:
+                for index in indices:
+                    responses[index] = fetch_view.run(
+                        user, operations[index].variables
+                    )
+
+        # info: position of the last operation run in the save transaction
+        saves_end = -1
+        if saves:
+            # info: fetches listed before the first save read the data
+            # without the saves of the batch
+            run_fetches([index for index in fetches if index < saves[0]])
+
+            failed_save = None
+            save_view = GenericSaveAPIView()
+            with transaction.atomic():
+                for index in range(saves[0], saves[-1] + 1):
+                    variables = operations[index].variables
+                    if operations[index].type == BatchOperationEnum.FETCH:
+                        # info: run in the transaction, to read the saves
+                        # listed before them. Their results are not cached,
+                        # as the saves may be rolled back.
+                        responses[index] = fetch_view.run(
+                            user, variables, use_cache=False
+                        )
+                        continue
+                    responses[index] = save_view.run(user, variables)
+                    if responses[index].status_code >= 400:
+                        failed_save = index
+                        transaction.set_rollback(True)
+                        break
+            saves_end = saves[-1]
+            if failed_save is not None:
+                # info: the other saves are rolled back with the failed one
+                for index in saves:
+                    if index != failed_save:
+                        responses[index] = error_response(
+                            error="Not saved, another save of the batch "
+                            "failed.",
+                            code="DGA-V047",
+                        )
+                # info: fetches after the first save run again, on the data
+                # without the rolled back saves
+                saves_end = saves[0]
+
+        # info: fetches listed after the saves, or all the fetches of a
+        # batch without saves, run concurrently
+        run_fetches([index for index in fetches if index > saves_end])
+
+        results = []
+        for response in responses:
+            # info: responses from the result cache are rendered already
+            data = (
+                response.data
+                if isinstance(response, Response)
+                else json.loads(response.content)
+            )
+            results.append({"status": response.status_code, **data})
+        return success_response(data=results, message="Completed.")
+
+
+class GenericExportAPIView(APIView):
+    """
+    Export API
+    - Strict typing is enabled for payload.
+    - Checks if model exists or not.
+    - Checks if user has 'view' permission.
+    - Streams all matching records as NDJSON or CSV.
+    """
+
+    content_types = {
+        "ndjson": "application/x-ndjson",
+        "csv": "text/csv",
+    }
+
+    def post(self, *args, **kwargs):
+
+        payload = self.request.data.get("payload", {}).get("variables", {})
+        try:
+            validated_payload_data = ExportPayload(**payload)
+        except ValidationError as e:
+            error_msg = e.errors()[0].get("msg")
+            error_loc = e.errors()[0].get("loc")
+            error = f"{error_msg}{error_loc}"
+
+            return error_response(error=error, code="DGA-V042")
+
+        export_format = (
+            validated_payload_data.format or ExportFormatEnum.NDJSON
+        ).value
+
+        try:
+            model = get_model_by_name(validated_payload_data.modelName)
+            in_query_models = get_in_query_models(
+                validated_payload_data.get_filters()
+            )
+        except Exception as e:
+            return error_response(
+                error=e.args[0]["error"],
+                code=e.args[0]["code"],
+                http_status=e.args[0]["http_status"],
+            )
+
+        permissions = [
+            make_permission_str(export_model, "fetch")
+            for export_model in [model, *in_query_models]
+        ]
+        if not self.request.user.has_perms(permissions):
+            return error_response(
+                error="Something went wrong!!! Please contact the "
+                "administrator.",
+                code="DGA-V043",
+                http_status=status.HTTP_404_NOT_FOUND,
+            )
+        try:
+            lines = export_data(
+                model,
+                validated_payload_data.filters,
+                validated_payload_data.fields,
+                validated_payload_data.sort,
+                validated_payload_data.distinct,
+                export_format,
+                validated_payload_data.filterGroup,
+            )
+        except Exception as e:
+            return error_response(**e.args[0])
+
+        response = StreamingHttpResponse(
+            lines, content_type=self.content_types[export_format]
+        )
+        model_name = getattr(model, "_meta").model_name
+        response["Content-Disposition"] = (
+            f'attachment; filename="{model_name}.{export_format}"'
+        )
+        return response
+
 
 class GenericLoginAPIView(APIView):
     """
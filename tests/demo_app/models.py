@@ -60,3 +60,13 @@ class Customer(BaseClass):
 
     class Meta:
         app_label = "demo_app"
+
+
+class PremiumCustomer(Customer):
+    # info: multi-table inherited model, its rows span two tables
+    level = models.CharField(max_length=15, default="gold")
+    # info: named like the keys of facet counts
+    value = models.IntegerField(default=0)
+
+    class Meta:
+        app_label = "demo_app"
@@ -0,0 +1,231 @@
+# Test cases for aggregate API
+import pytest
+from django.contrib.auth.models import Permission
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from model_bakery import baker
+
+from django_generic_api.tests.demo_app.models import Customer, StudentClass
+from fixtures.api import (
+    api_client,
+    view_perm_token,
+    add_perm_token,
+    save_perm_user,
+    view_perm_user,
+    customer1,
+    customer2,
+)
+
+# To ensure the import is retained
+usage = save_perm_user
+
+
+@pytest.mark.django_db
+class TestGenericAggregateAPI:
+
+    def test_aggregate_by_group(
+        self, customer1, customer2, api_client, view_perm_token
+    ):
+        """
+        User counts the records per group in a single query.
+        """
+        baker.make(
+            Customer,
+            name="test_user3",
+            email=customer1.email,
+            std_class=customer1.std_class,
+        )
+        aggregate_payload = {
+            "payload": {
+                "variables": {
+                    "modelName": "demo_app.customer",
+                    "fields": ["std_class__name"],
+                    "filters": [],
+                    "measures": [
+                        {"function": "count"},
+                        {"function": "countDistinct", "field": "email"},
+                        {"function": "max", "field": "name", "alias": "last"},
+                    ],
+                }
+            }
+        }
+        headers = {"Authorization": f"Bearer {view_perm_token}"}
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.post(
+                "/v1/aggregate/",
+                aggregate_payload,
+                format="json",
+                headers=headers,
+            )
+        assert response.status_code == 200
+        assert response.data["data"] == {
+            "total": 2,
+            "data": [
+                {
+                    "std_class__name": None,
+                    "count": 1,
+                    "countDistinct_email": 1,
+                    "last": "test_user2",
+                },
+                {
+                    "std_class__name": "Class-1",
+                    "count": 2,
+                    "countDistinct_email": 1,
+                    "last": "test_user3",
+                },
+            ],
+        }
+        assert [
+            query
+            for query in queries.captured_queries
+            if "GROUP BY" in query["sql"]
+        ] == queries.captured_queries[-1:]
+
+    def test_aggregate_sort_and_page(
+        self, api_client, view_perm_user, view_perm_token
+    ):
+        """
+        Groups are sorted by a measure and paginated.
+        """
+        view_perm_user.user_permissions.add(
+            Permission.objects.get(codename="view_studentclass")
+        )
+        for address, count in [("HYD", 10), ("HYD", 20), ("GOA", 5)]:
+            baker.make(
+                StudentClass,
+                name="Class",
+                address=address,
+                count_of_students=count,
+            )
+        aggregate_payload = {
+            "payload": {
+                "variables": {
+                    "modelName": "demo_app.studentclass",
+                    "fields": ["address"],
+                    "filters": [],
+                    "measures": [
+                        {
+                            "function": "sum",
+                            "field": "count_of_students",
+                            "alias": "students",
+                        }
+                    ],
+                    "pageNumber": 2,
+                    "pageSize": 1,
+                    "sort": {"field": "students", "order_by": "desc"},
+                }
+            }
+        }
+        headers = {"Authorization": f"Bearer {view_perm_token}"}
+        response = api_client.post(
+            "/v1/aggregate/",
+            aggregate_payload,
+            format="json",
+            headers=headers,
+        )
+        assert response.status_code == 200
+        assert response.data["data"] == {
+            "total": 2,
+            "data": [{"address": "GOA", "students": 5}],
+        }
+
+    def test_aggregate_totals(
+        self, customer1, customer2, api_client, view_perm_token
+    ):
+        """
+        Without group-by fields, the totals of the filtered records are
+        returned as one group.
+        """
+        aggregate_payload = {
+            "payload": {
+                "variables": {
+                    "modelName": "demo_app.customer",
+                    "fields": [],
+                    "filters": [
+                        {
+                            "operator": "eq",
+                            "name": "name",
+                            "value": ["unknown"],
+                        }
+                    ],
+                    "measures": [
+                        {"function": "count"},
+                        {
+                            "function": "avg",
+                            "field": "std_class__count_of_students",
+                        },
+                    ],
+                }
+            }
+        }
+        headers = {"Authorization": f"Bearer {view_perm_token}"}
+        response = api_client.post(
+            "/v1/aggregate/",
+            aggregate_payload,
+            format="json",
+            headers=headers,
+        )
+        assert response.status_code == 200
+        assert response.data["data"] == {
+            "total": 1,
+            "data": [{"count": 0, "avg_std_class_count_of_students": None}],
+        }
+
+    def test_aggregate_invalid_measure(
+        self, customer1, api_client, view_perm_token
+    ):
+        """
+        Measures are validated against the payload and the model fields.
+        """
+        headers = {"Authorization": f"Bearer {view_perm_token}"}
+        codes = []
+        for measure in [
+            {"function": "sum"},
+            {"function": "sum", "field": "name"},
+            {"function": "count", "alias": "email"},
+        ]:
+            aggregate_payload = {
+                "payload": {
+                    "variables": {
+                        "modelName": "demo_app.customer",
+                        "fields": ["name"],
+                        "filters": [],
+                        "measures": [measure],
+                    }
+                }
+            }
+            response = api_client.post(
+                "/v1/aggregate/",
+                aggregate_payload,
+                format="json",
+                headers=headers,
+            )
+            assert response.status_code == 400
+            codes.append(response.data["code"])
+        assert codes == ["DGA-V044", "DGA-S021", "DGA-S021"]
+
+    def test_aggregate_without_view_permission(
+        self, customer1, api_client, add_perm_token
+    ):
+        """
+        User without view permission cannot aggregate.
+        """
+        aggregate_payload = {
+            "payload": {
+                "variables": {
+                    "modelName": "demo_app.customer",
+                    "fields": ["name"],
+                    "filters": [],
+                    "measures": [{"function": "count"}],
+                }
+            }
+        }
+        headers = {"Authorization": f"Bearer {add_perm_token}"}
+        response = api_client.post(
+            "/v1/aggregate/",
+            aggregate_payload,
+            format="json",
+            headers=headers,
+        )
+        assert response.status_code == 404
+        assert response.data["code"] == "DGA-V045"
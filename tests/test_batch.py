@@ -0,0 +1,261 @@
+# Test cases for batch API
+from unittest.mock import patch
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from django_generic_api.tests.demo_app.models import Customer
+from fixtures.api import (
+    api_client,
+    all_perm_token,
+    all_perm_user,
+    view_perm_token,
+    view_perm_user,
+    customer1,
+    customer2,
+)
+
+# To ensure the import is retained
+usage = all_perm_user
+usage1 = view_perm_user
+
+
+def make_customer_input(name):
+    return {
+        "name": name,
+        "dob": "2020-01-21",
+        "email": "ltest1@mail.com",
+        "phone_no": "012345",
+        "address": "HYD",
+        "pin_code": "100",
+        "status": "123",
+    }
+
+
+@pytest.mark.django_db
+class TestGenericBatchAPI:
+
+    def test_batch_fetch_and_save(self, customer1, api_client, all_perm_token):
+        """
+        User runs fetches and a save in one request, authenticated once.
+        The operations run in order, a fetch listed before the save does not
+        read it.
+        """
+        batch_payload = {
+            "payload": {
+                "variables": {
+                    "operations": [
+                        {
+                            "type": "fetch",
+                            "variables": {
+                                "modelName": "demo_app.customer",
+                                "fields": ["name"],
+                                "filters": [],
+                                "sort": {"field": "name", "order_by": "asc"},
+                            },
+                        },
+                        {
+                            "type": "save",
+                            "variables": {
+                                "modelName": "demo_app.customer",
+                                "saveInput": [make_customer_input("user3")],
+                            },
+                        },
+                        {
+                            "type": "fetch",
+                            "variables": {
+                                "modelName": "demo_app.customer",
+                                "fields": ["name"],
+                                "filters": [],
+                                "sort": {"field": "name", "order_by": "asc"},
+                            },
+                        },
+                        {
+                            "type": "fetch",
+                            "variables": {
+                                "modelName": "demo_app.unknown",
+                                "fields": ["name"],
+                                "filters": [],
+                            },
+                        },
+                    ]
+                }
+            }
+        }
+        headers = {"Authorization": f"Bearer {all_perm_token}"}
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.post(
+                "/v1/batch/", batch_payload, format="json", headers=headers
+            )
+        assert response.status_code == 200
+        results = response.data["data"]
+        assert [result["status"] for result in results] == [
+            200,
+            201,
+            200,
+            400,
+        ]
+        assert results[0]["data"]["data"] == [{"name": "test_user1"}]
+        assert results[1]["message"] == ["Record created successfully."]
+        assert results[2]["data"]["data"] == [
+            {"name": "test_user1"},
+            {"name": "user3"},
+        ]
+        assert results[3]["code"] == "DGA-S013"
+        # info: the user and the permissions are read once
+        assert (
+            len(
+                [
+                    query
+                    for query in queries.captured_queries
+                    if "auth_permission" in query["sql"]
+                ]
+            )
+            == 2
+        )
+
+    def test_batch_save_rollback(self, customer1, api_client, all_perm_token):
+        """
+        The saves of a batch run in one transaction, a failed save rolls
+        back the others. The fetches after the first save then read the data
+        without them.
+        """
+        invalid_input = make_customer_input("user4")
+        invalid_input["dob"] = "invalid"
+        batch_payload = {
+            "payload": {
+                "variables": {
+                    "operations": [
+                        {
+                            "type": "save",
+                            "variables": {
+                                "modelName": "demo_app.customer",
+                                "saveInput": [make_customer_input("user3")],
+                            },
+                        },
+                        {
+                            "type": "fetch",
+                            "variables": {
+                                "modelName": "demo_app.customer",
+                                "fields": ["name"],
+                                "filters": [],
+                                "sort": {"field": "name", "order_by": "asc"},
+                            },
+                        },
+                        {
+                            "type": "save",
+                            "variables": {
+                                "modelName": "demo_app.customer",
+                                "saveInput": [invalid_input],
+                            },
+                        },
+                        {
+                            "type": "fetch",
+                            "variables": {
+                                "modelName": "demo_app.customer",
+                                "fields": ["name"],
+                                "filters": [],
+                                "sort": {"field": "name", "order_by": "asc"},
+                            },
+                        },
+                    ]
+                }
+            }
+        }
+        headers = {"Authorization": f"Bearer {all_perm_token}"}
+        response = api_client.post(
+            "/v1/batch/", batch_payload, format="json", headers=headers
+        )
+        assert response.status_code == 200
+        results = response.data["data"]
+        assert [result["status"] for result in results] == [400, 200, 400, 200]
+        assert results[0]["code"] == "DGA-V047"
+        assert results[1]["data"]["data"] == [{"name": "test_user1"}]
+        assert results[3]["data"]["data"] == [{"name": "test_user1"}]
+        assert Customer.objects.count() == 1
+
+    def test_batch_invalid_payload(self, api_client, view_perm_token):
+        """
+        A batch needs a list of fetch or save operations.
+        """
+        headers = {"Authorization": f"Bearer {view_perm_token}"}
+        for operations in [[], [{"type": "delete", "variables": {}}]]:
+            batch_payload = {"payload": {"variables": {"operations": []}}}
+            batch_payload["payload"]["variables"]["operations"] = operations
+            response = api_client.post(
+                "/v1/batch/", batch_payload, format="json", headers=headers
+            )
+            assert response.status_code == 400
+            assert response.data["code"] == "DGA-V046"
+
+
+class InlineExecutor:
+    """
+    Runs the thread pool tasks in the test thread, which owns the in-memory
+    test database.
+    """
+
+    instances = []
+
+    def __init__(self, max_workers):
+        self.max_workers = max_workers
+        self.instances.append(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def map(self, fn, items):
+        return [fn(item) for item in items]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_batch_concurrent_fetches(
+    customer1, customer2, api_client, view_perm_token
+):
+    """
+    Fetches outside a transaction run on the bounded thread pool, and come
+    back in the operations order.
+    """
+    names = ["test_user2", "test_user1", "test_user2"]
+    batch_payload = {
+        "payload": {
+            "variables": {
+                "operations": [
+                    {
+                        "type": "fetch",
+                        "variables": {
+                            "modelName": "demo_app.customer",
+                            "fields": ["name"],
+                            "filters": [
+                                {
+                                    "operator": "eq",
+                                    "name": "name",
+                                    "value": [name],
+                                }
+                            ],
+                        },
+                    }
+                    for name in names
+                ]
+            }
+        }
+    }
+    headers = {"Authorization": f"Bearer {view_perm_token}"}
+    with patch(
+        "django_generic_api.django_generic_api.views.ThreadPoolExecutor",
+        InlineExecutor,
+    ):
+        response = api_client.post(
+            "/v1/batch/", batch_payload, format="json", headers=headers
+        )
+    assert response.status_code == 200
+    assert [executor.max_workers for executor in InlineExecutor.instances] == [
+        3
+    ]
+    assert [result["data"]["data"] for result in response.data["data"]] == [
+        [{"name": name}] for name in names
+    ]
@@ -0,0 +1,202 @@
+# Test cases for export API
+import datetime
+import json
+
+import pytest
+from model_bakery import baker
+
+from django_generic_api.tests.demo_app.models import Customer
+
+from fixtures.api import (
+    api_client,
+    view_perm_token,
+    add_perm_token,
+    save_perm_user,
+    view_perm_user,
+    customer1,
+    customer2,
+)
+
+# To ensure the import is retained
+usage = save_perm_user
+usage1 = view_perm_user
+
+
+@pytest.mark.django_db
+class TestGenericExportAPI:
+
+    def test_export_ndjson(
+        self, customer1, customer2, api_client, view_perm_token
+    ):
+        """
+        User exports all matching records as NDJSON.
+        """
+        export_payload = {
+            "payload": {
+                "variables": {
+                    "modelName": "demo_app.customer",
+                    "fields": ["name", "std_class__name"],
+                    "filters": [],
+                    "sort": {"field": "name", "order_by": "asc"},
+                }
+            }
+        }
+        headers = {"Authorization": f"Bearer {view_perm_token}"}
+        response = api_client.post(
+            "/v1/export/",
+            export_payload,
+            format="json",
+            headers=headers,
+        )
+        assert response.status_code == 200
+        assert response["Content-Type"] == "application/x-ndjson"
+        assert response["Content-Disposition"] == (
+            'attachment; filename="customer.ndjson"'
+        )
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        assert [json.loads(line) for line in lines] == [
+            {"name": customer1.name, "std_class__name": "Class-1"},
+            {"name": customer2.name, "std_class__name": None},
+        ]
+
+    def test_export_ndjson_microseconds(self, api_client, view_perm_token):
+        """
+        Exported datetimes keep their microseconds, like fetched ones.
+        """
+        customer = baker.make(
+            Customer,
+            inserted_timestamp=datetime.datetime(2024, 1, 2, 3, 4, 5, 123456),
+        )
+        export_payload = {
+            "payload": {
+                "variables": {
+                    "modelName": "demo_app.customer",
+                    "fields": ["inserted_timestamp"],
+                    "filters": [],
+                }
+            }
+        }
+        headers = {"Authorization": f"Bearer {view_perm_token}"}
+        response = api_client.post(
+            "/v1/export/",
+            export_payload,
+            format="json",
+            headers=headers,
+        )
+        assert response.status_code == 200
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        assert [json.loads(line) for line in lines] == [
+            {"inserted_timestamp": customer.inserted_timestamp.isoformat()}
+        ]
+
+    def test_export_csv(
+        self, customer1, customer2, api_client, view_perm_token
+    ):
+        """
+        User exports filtered records as CSV, with a header row.
+        """
+        export_payload = {
+            "payload": {
+                "variables": {
+                    "modelName": "demo_app.customer",
+                    "fields": ["name", "email"],
+                    "filters": [
+                        {
+                            "operator": "eq",
+                            "name": "name",
+                            "value": [customer1.name],
+                        }
+                    ],
+                    "format": "csv",
+                }
+            }
+        }
+        headers = {"Authorization": f"Bearer {view_perm_token}"}
+        response = api_client.post(
+            "/v1/export/",
+            export_payload,
+            format="json",
+            headers=headers,
+        )
+        assert response.status_code == 200
+        assert response["Content-Type"] == "text/csv"
+        content = b"".join(response.streaming_content).decode()
+        assert content == (
+            f"name,email\r\n{customer1.name},{customer1.email}\r\n"
+        )
+
+    def test_export_without_view_permission(
+        self, customer1, api_client, add_perm_token
+    ):
+        """
+        User without view permission cannot export.
+        """
+        export_payload = {
+            "payload": {
+                "variables": {
+                    "modelName": "demo_app.customer",
+                    "fields": ["name"],
+                    "filters": [],
+                }
+            }
+        }
+        headers = {"Authorization": f"Bearer {add_perm_token}"}
+        response = api_client.post(
+            "/v1/export/",
+            export_payload,
+            format="json",
+            headers=headers,
+        )
+        assert response.status_code == 404
+        assert response.data["code"] == "DGA-V043"
+
+    def test_export_invalid_format(
+        self, customer1, api_client, view_perm_token
+    ):
+        """
+        User requests an unsupported export format.
+        """
+        export_payload = {
+            "payload": {
+                "variables": {
+                    "modelName": "demo_app.customer",
+                    "fields": ["name"],
+                    "filters": [],
+                    "format": "xml",
+                }
+            }
+        }
+        headers = {"Authorization": f"Bearer {view_perm_token}"}
+        response = api_client.post(
+            "/v1/export/",
+            export_payload,
+            format="json",
+            headers=headers,
+        )
+        assert response.status_code == 400
+        assert response.data["code"] == "DGA-V042"
+
+    def test_export_invalid_field(
+        self, customer1, api_client, view_perm_token
+    ):
+        """
+        Fields are validated before the export starts.
+        """
+        export_payload = {
+            "payload": {
+                "variables": {
+                    "modelName": "demo_app.customer",
+                    "fields": ["name", "unknown"],
+                    "filters": [],
+                }
+            }
+        }
+        headers = {"Authorization": f"Bearer {view_perm_token}"}
+        response = api_client.post(
+            "/v1/export/",
+            export_payload,
+            format="json",
+            headers=headers,
+        )
+        assert response.status_code == 400
+        assert response.data["code"] == "DGA-U002"
@@ -1,9 +1,38 @@
 # Test cases for fetch API
+import datetime
+import threading
 from unittest.mock import patch
 
 import pytest
+from django.contrib.auth.models import Permission
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.db.models.signals import post_save
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from model_bakery import baker
 from rest_framework_simplejwt.exceptions import TokenError
 
+from django_generic_api.django_generic_api.management.commands.build_search_index import (  # noqa: E501
+    Command as SearchIndexCommand,
+)
+from django_generic_api.django_generic_api.services import (
+    bump_model_version,
+    bump_model_version_on_change,
+    compile_filter_plan,
+    fetch_data,
+    get_filter_shape,
+    get_or_set_fetch_result,
+)
+from django_generic_api.django_generic_api.payload_models import (
+    FetchFilter,
+    FetchSort,
+)
+from django_generic_api.tests.demo_app.models import (
+    Customer,
+    PremiumCustomer,
+)
 from fixtures.api import (
     api_client,
     view_perm_token,
@@ -190,6 +219,39 @@ class TestGenericFetchAPI:
         ]
         assert response_data["message"] == "Completed."
 
+    def test_fetch_filter_fk_field_name(
+        self, customer1, customer2, api_client, view_perm_token
+    ):
+        """
+        Filter name is a foreign key path.
+        """
+        fetch_payload = {
+            "payload": {
+                "variables": {
+                    "modelName": "demo_app.customer",
+                    "fields": ["name"],
+                    "filters": [
+                        {
+                            "operator": "eq",
+                            "name": "std_class__name",
+                            "value": ["Class-1"],
+                        }
+                    ],
+                }
+            }
+        }
+        headers = {"Authorization": f"Bearer {view_perm_token}"}
+        response = api_client.post(
+            "/v1/fetch/",
+            fetch_payload,
+            format="json",
+            headers=headers,
+        )
+        response_data = response.data
+        assert response.status_code == 200
+        assert response_data["data"]["total"] == 1
+        assert response_data["data"]["data"] == [{"name": customer1.name}]
+
     def test_fetch_filter_operator_in(
         self, customer1, customer2, api_client, view_perm_token
     ):
@@ -522,6 +584,1586 @@ class TestGenericFetchAPI:
         assert response_data["error"] == "Model not found"
         assert response_data["code"] == "DGA-S013"
 
+    def test_fetch_with_uppercase_model_name(
+        self, customer1, api_client, view_perm_token
+    ):
+        """
+        User fetches with upper case model name, it is resolved from the
+        model registry.
+        """
+        fetch_payload = {
+            "payload": {
+                "variables": {
+                    "modelName": "CUSTOMER",
+                    "fields": ["name", "email"],
+                    "filters": [
+                        {
+                            "operator": "eq",
+                            "name": "phone_no",
+                            "value": ["123456"],
+                        }
+                    ],
+                }
+            }
+        }
+        headers = {"Authorization": f"Bearer {view_perm_token}"}
+        response = api_client.post(
+            "/v1/fetch/",
+            fetch_payload,
+            format="json",
+            headers=headers,
+        )
+        response_data = response.data
+        assert response.status_code == 200
+        assert response_data["data"]["data"] == [
+            {"name": customer1.name, "email": customer1.email}
+        ]
+
+    def test_fetch_with_unknown_model_name_repeated(
+        self, customer1, api_client, view_perm_token
+    ):
+        """
+        User fetches an unknown model twice, the cached miss returns the
+        same error.
+        """
+        fetch_payload = {
+            "payload": {
+                "variables": {
+                    "modelName": "unknown_model",
+                    "fields": ["name", "email"],
+                    "filters": [
+                        {
+                            "operator": "eq",
+                            "name": "phone_no",
+                            "value": ["123456"],
+                        }
+                    ],
+                }
+            }
+        }
+        headers = {"Authorization": f"Bearer {view_perm_token}"}
+        for _ in range(2):
+            response = api_client.post(
+                "/v1/fetch/",
+                fetch_payload,
+                format="json",
+                headers=headers,
+            )
+            response_data = response.data
+            assert response.status_code == 400
+            assert response_data["error"] == "Model not found"
+            assert response_data["code"] == "DGA-S012"
+
+    def test_fetch_cursor_pagination(
+        self, customer1, customer2, api_client, view_perm_token
+    ):
+        """
+        User pages through records with cursor pagination.
+        """
+        baker.make_recipe("demo_app.test_instance")
+        fetch_payload = {
+            "payload": {
+                "variables": {
+                    "modelName": "demo_app.customer",
+                    "fields": ["name"],
+                    "filters": [],
+                    "pageSize": 2,
+                    "sort": {"field": "name", "order_by": "asc"},
+                    "pagination": "cursor",
+                }
+            }
+        }
+        headers = {"Authorization": f"Bearer {view_perm_token}"}
+        response = api_client.post(
+            "/v1/fetch/",
+            fetch_payload,
+            format="json",
+            headers=headers,
+        )
+        response_data = response.data
+        assert response.status_code == 200
+        assert response_data["data"]["total"] == 3
+        assert response_data["data"]["data"] == [
+            {"name": "instance_1"},
+            {"name": "test_user1"},
+        ]
+        assert response_data["data"]["nextCursor"]
+
+        fetch_payload["payload"]["variables"]["cursor"] = response_data[
+            "data"
+        ]["nextCursor"]
+        response = api_client.post(
+            "/v1/fetch/",
+            fetch_payload,
+            format="json",
+            headers=headers,
+        )
+        response_data = response.data
+        assert response.status_code == 200
+        assert response_data["data"]["data"] == [{"name": "test_user2"}]
+        assert response_data["data"]["nextCursor"] is None
+
+    def test_fetch_cursor_pagination_microseconds(
+        self, api_client, view_perm_token
+    ):
+        """
+        Cursors keep the full precision of datetime sort values, so records
+        less than a millisecond apart are not returned twice.
+        """
+        timestamp = timezone.now().replace(microsecond=0)
+        for position in range(5):
+            baker.make(
+                Customer,
+                name=f"n{position}",
+                inserted_timestamp=timestamp
+                + datetime.timedelta(microseconds=position),
+            )
+        fetch_payload = {
+            "payload": {
+                "variables": {
+                    "modelName": "demo_app.customer",
+                    "fields": ["name"],
+                    "filters": [],
+                    "pageSize": 2,
+                    "sort": {"field": "inserted_timestamp", "order_by": "asc"},
+                    "pagination": "cursor",
+                }
+            }
+        }
+        headers = {"Authorization": f"Bearer {view_perm_token}"}
+        names = []
+        for _ in range(5):
+            response = api_client.post(
+                "/v1/fetch/", fetch_payload, format="json", headers=headers
+            )
+            assert response.status_code == 200
+            names.extend(
+                item["name"] for item in response.data["data"]["data"]
+            )
+            next_cursor = response.data["data"]["nextCursor"]
+            if next_cursor is None:
+                break
+            fetch_payload["payload"]["variables"]["cursor"] = next_cursor
+        assert names == ["n0", "n1", "n2", "n3", "n4"]
+
+    def test_fetch_cursor_pagination_distinct(
+        self, customer1, api_client, view_perm_user, view_perm_token
+    ):
+        """
+        Cursor pagination applies DISTINCT when a filter crosses a to-many
+        relation.
+        """
+        view_perm_user.user_permissions.add(
+            Permission.objects.get(codename="view_studentclass")
+        )
+        baker.make(Customer, name="test_user3", std_class=customer1.std_class)
+        headers = {"Authorization": f"Bearer {view_perm_token}"}
+        for distinct in [None, True]:
+            fetch_payload = {
+                "payload": {
+                    "variables": {
+                        "modelName": "demo_app.studentclass",
+                        "fields": ["name"],
+                        "filters": [
+                            {
+                                "operator": "in",
+                                "name": "class_of_student__name",
+                                "value": ["test_user1", "test_user3"],
+                            }
+                        ],
+                        "distinct": distinct,
+                        "pagination": "cursor",
+                    }
+                }
+            }
+            response = api_client.post(
+                "/v1/fetch/", fetch_payload, format="json", headers=headers
+            )
+            assert response.status_code == 200
+            assert response.data["data"]["total"] == 1
+            assert response.data["data"]["data"] == [{"name": "Class-1"}]
+
+    def test_fetch_invalid_cursor(
+        self, customer1, api_client, view_perm_token
+    ):
+        """
+        User sends a cursor which was not made by the fetch API.
+        """
+        fetch_payload = {
+            "payload": {
+                "variables": {
+                    "modelName": "demo_app.customer",
+                    "fields": ["name"],
+                    "filters": [],
+                    "pagination": "cursor",
+                    "cursor": "abc",
+                }
+            }
+        }
+        headers = {"Authorization": f"Bearer {view_perm_token}"}
+        response = api_client.post(
+            "/v1/fetch/",
+            fetch_payload,
+            format="json",
+            headers=headers,
+        )
+        response_data = response.data
+        assert response.status_code == 400
+        assert response_data["error"] == "Invalid cursor"
+        assert response_data["code"] == "DGA-S018"
+
+    @pytest.mark.parametrize(
+        "count_mode, expected",
+        [
+            ("capped", {"total": 1, "totalCapped": True}),
+            ("none", {"total": None, "hasNext": True}),
+            # SQLite does not expose planner estimates
+            ("estimated", {"total": 2, "totalEstimated": False}),
+        ],
+    )
+    def test_fetch_count_mode(
+        self,
+        customer1,
+        customer2,
+        api_client,
+        view_perm_token,
+        count_mode,
+        expected,
+    ):
+        """
+        User selects how the total count is computed.
+        """
+        fetch_payload = {
+            "payload": {
+                "variables": {
+                    "modelName": "demo_app.customer",
+                    "fields": ["name"],
+                    "filters": [],
+                    "pageSize": 1,
+                    "sort": {"field": "name", "order_by": "asc"},
+                    "countMode": count_mode,
+                    "countCap": 1,
+                }
+            }
+        }
+        headers = {"Authorization": f"Bearer {view_perm_token}"}
+        response = api_client.post(
+            "/v1/fetch/",
+            fetch_payload,
+            format="json",
+            headers=headers,
+        )
+        response_data = response.data
+        assert response.status_code == 200
+        assert response_data["data"]["data"] == [{"name": "test_user1"}]
+        for key, value in expected.items():
+            assert response_data["data"][key] == value
+
+    @pytest.mark.parametrize(
+        "page_number, expected_data, expected_count_queries",
+        [
+            (1, [{"name": "test_user1"}], 0),
+            (2, [{"name": "test_user2"}], 0),
+            # empty page falls back to a separate count
+            (3, [], 1),
+        ],
+    )
+    def test_fetch_page_with_window_total(
+        self,
+        customer1,
+        customer2,
+        api_client,
+        view_perm_token,
+        page_number,
+        expected_data,
+        expected_count_queries,
+    ):
+        """
+        Page and total are read in one query with COUNT(*) OVER ().
+        """
+        fetch_payload = {
+            "payload": {
+                "variables": {
+                    "modelName": "demo_app.customer",
+                    "fields": ["name"],
+                    "filters": [],
+                    "pageNumber": page_number,
+                    "pageSize": 1,
+                    "sort": {"field": "name", "order_by": "asc"},
+                    "distinct": False,
+                }
+            }
+        }
+        headers = {"Authorization": f"Bearer {view_perm_token}"}
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.post(
+                "/v1/fetch/",
+                fetch_payload,
+                format="json",
+                headers=headers,
+            )
+        response_data = response.data
+        assert response.status_code == 200
+        assert response_data["data"]["total"] == 2
+        assert response_data["data"]["data"] == expected_data
+        count_queries = [
+            query["sql"]
+            for query in queries.captured_queries
+            if query["sql"].startswith('SELECT COUNT(*) AS "__count"')
+        ]
+        assert len(count_queries) == expected_count_queries
+
+    def test_fetch_exact_count_cache(
+        self, customer1, api_client, view_perm_token
+    ):
+        """
+        Exact counts are cached when COUNT_CACHE_TIMEOUT is set.
+        """
+        fetch_payload = {
+            "payload": {
+                "variables": {
+                    "modelName": "demo_app.customer",
+                    "fields": ["name"],
+                    "filters": [],
+                }
+            }
+        }
+        headers = {"Authorization": f"Bearer {view_perm_token}"}
+        with patch(
+            "django_generic_api.django_generic_api.services"
+            ".count_cache_timeout",
+            60,
+        ):
+            totals = []
+            for _ in range(2):
+                response = api_client.post(
+                    "/v1/fetch/",
+                    fetch_payload,
+                    format="json",
+                    headers=headers,
+                )
+                totals.append(response.data["data"]["total"])
+                baker.make_recipe("demo_app.test_instance")
+        cache.clear()
+        assert totals == [1, 1]
+
+    def test_fetch_result_cache(
+        self,
+        customer1,
+        api_client,
+        view_perm_token,
+        add_perm_token,
+        django_capture_on_commit_callbacks,
+    ):
+        """
+        Fetch responses are cached when RESULT_CACHE_TIMEOUT is set, and
+        dropped when a save through the API is committed.
+        """
+        fetch_payload = {
+            "payload": {
+                "variables": {
+                    "modelName": "demo_app.customer",
+                    "fields": ["name"],
+                    "filters": [],
+                }
+            }
+        }
+        save_payload = {
+            "payload": {
+                "variables": {
+                    "modelName": "demo_app.customer",
+                    "saveInput": [
+                        {
+                            "name": "test_user3",
+                            "dob": "2020-01-21",
+                            "email": "ltest3@mail.com",
+                            "phone_no": "012345",
+                            "address": "HYD",
+                            "pin_code": "100",
+                            "status": "123",
+                        }
+                    ],
+                }
+            }
+        }
+        headers = {"Authorization": f"Bearer {view_perm_token}"}
+        totals = []
+        with patch(
+            "django_generic_api.django_generic_api.views"
+            ".result_cache_timeout",
+            60,
+        ), patch(
+            "django_generic_api.django_generic_api.services"
+            ".result_cache_timeout",
+            60,
+        ):
+            for step in ["fetch", "create", "fetch", "save", "fetch"]:
+                if step == "create":
+                    # info: no signal receivers, the cached result is kept
+                    baker.make_recipe("demo_app.test_instance")
+                elif step == "save":
+                    with django_capture_on_commit_callbacks(
+                        execute=True
+                    ) as callbacks:
+                        response = api_client.post(
+                            "/v1/save/",
+                            save_payload,
+                            format="json",
+                            headers={
+                                "Authorization": f"Bearer {add_perm_token}"
+                            },
+                        )
+                    assert response.status_code == 201
+                    assert len(callbacks) == 1
+                else:
+                    response = api_client.post(
+                        "/v1/fetch/",
+                        fetch_payload,
+                        format="json",
+                        headers=headers,
+                    )
+                    assert response.status_code == 200
+                    assert response.json()["message"] == "Completed."
+                    totals.append(response.json()["data"]["total"])
+        cache.clear()
+        assert totals == [1, 1, 3]
+
+    def test_fetch_result_cache_signal_invalidation(
+        self,
+        customer1,
+        api_client,
+        view_perm_token,
+        django_capture_on_commit_callbacks,
+    ):
+        """
+        post_save receivers drop the cached fetch results of the model.
+        """
+        fetch_payload = {
+            "payload": {
+                "variables": {
+                    "modelName": "demo_app.customer",
+                    "fields": ["name"],
+                    "filters": [],
+                }
+            }
+        }
+        headers = {"Authorization": f"Bearer {view_perm_token}"}
+        totals = []
+        post_save.connect(bump_model_version_on_change)
+        try:
+            with patch(
+                "django_generic_api.django_generic_api.views"
+                ".result_cache_timeout",
+                60,
+            ):
+                for _ in range(2):
+                    response = api_client.post(
+                        "/v1/fetch/",
+                        fetch_payload,
+                        format="json",
+                        headers=headers,
+                    )
+                    totals.append(response.json()["data"]["total"])
+                    with django_capture_on_commit_callbacks(execute=True):
+                        baker.make_recipe("demo_app.test_instance")
+        finally:
+            post_save.disconnect(bump_model_version_on_change)
+            cache.clear()
+        assert totals == [1, 2]
+
+    def test_fetch_result_lock_released_without_result(self):
+        """
+        A waiter takes the lock when its holder releases it without storing
+        a result, instead of waiting for FETCH_LOCK_TIMEOUT.
+        """
+        cache_key = "dga:fetch:test"
+        cache.add(f"{cache_key}:lock", 1)
+
+        def release_lock(seconds):
+            # info: the lock holder fails while the waiter sleeps
+            cache.delete(f"{cache_key}:lock")
+
+        with patch(
+            "django_generic_api.django_generic_api.services.time.sleep",
+            side_effect=release_lock,
+        ) as sleep:
+            content = get_or_set_fetch_result(cache_key, lambda: b"data")
+        assert content == b"data"
+        assert sleep.call_count == 1
+        assert cache.get(f"{cache_key}:lock") is None
+
+    def test_fetch_etag(self, customer1, api_client, view_perm_token):
+        """
+        Fetch responses carry an ETag when ETAG is set, a matching
+        If-None-Match returns 304 without querying the model.
+        """
+        fetch_payload = {
+            "payload": {
+                "variables": {
+                    "modelName": "demo_app.customer",
+                    "fields": ["name"],
+                    "filters": [],
+                }
+            }
+        }
+        headers = {"Authorization": f"Bearer {view_perm_token}"}
+        with patch(
+            "django_generic_api.django_generic_api.views.fetch_etag", True
+        ):
+            response = api_client.post(
+                "/v1/fetch/", fetch_payload, format="json", headers=headers
+            )
+            etag = response["ETag"]
+            assert response.status_code == 200
+
+            with CaptureQueriesContext(connection) as queries:
+                response = api_client.post(
+                    "/v1/fetch/",
+                    fetch_payload,
+                    format="json",
+                    headers={**headers, "If-None-Match": f"W/{etag}"},
+                )
+            assert response.status_code == 304
+            assert response["ETag"] == etag
+            assert not [
+                query
+                for query in queries.captured_queries
+                if "demo_app_customer" in query["sql"]
+            ]
+
+            bump_model_version(Customer)
+            response = api_client.post(
+                "/v1/fetch/",
+                fetch_payload,
+                format="json",
+                headers={**headers, "If-None-Match": etag},
+            )
+        cache.clear()
+        assert response.status_code == 200
+        assert response["ETag"] != etag
+        assert response.data["data"]["total"] == 1
+
+    @pytest.mark.parametrize(
+        "operator, name, value, expected_names",
+        [
+            ("gte", "phone_no", ["456789"], ["test_user2"]),
+            ("lt", "phone_no", ["456789"], ["test_user1"]),
+            ("lte", "phone_no", ["456789"], ["test_user1", "test_user2"]),
+            ("range", "phone_no", ["1", "2"], ["test_user1"]),
+            ("startswith", "email", ["user1"], ["test_user1"]),
+            ("istartswith", "address", ["hyd"], ["test_user1", "test_user2"]),
+            ("endswith", "email", ["2@gmail.com"], ["test_user2"]),
+            ("isnull", "std_class", [True], ["test_user2"]),
+            ("isnull", "std_class__name", [False], ["test_user1"]),
+        ],
+    )
+    def test_fetch_filter_operators(
+        self,
+        customer1,
+        customer2,
+        api_client,
+        view_perm_token,
+        operator,
+        name,
+        value,
+        expected_names,
+    ):
+        """
+        User filters with comparison, range, prefix, suffix and null
+        operators.
+        """
+        fetch_payload = {
+            "payload": {
+                "variables": {
+                    "modelName": "demo_app.customer",
+                    "fields": ["name"],
+                    "filters": [
+                        {"operator": operator, "name": name, "value": value}
+                    ],
+                    "sort": {"field": "name", "order_by": "asc"},
+                }
+            }
+        }
+        headers = {"Authorization": f"Bearer {view_perm_token}"}
+        response = api_client.post(
+            "/v1/fetch/", fetch_payload, format="json", headers=headers
+        )
+        assert response.status_code == 200
+        assert [row["name"] for row in response.data["data"]["data"]] == (
+            expected_names
+        )
+
+    @pytest.mark.parametrize(
+        "operator, value, error",
+        [
+            ("range", ["1"], "Range filters must have two values"),
+            ("isnull", ["yes"], "Isnull filters must have a boolean value"),
+        ],
+    )
+    def test_invalid_filter_operator_value(
+        self, customer1, api_client, view_perm_token, operator, value, error
+    ):
+        """
+        Range filters take two values and isnull filters a boolean.
+        """
+        fetch_payload = {
+            "payload": {
+                "variables": {
+                    "modelName": "demo_app.customer",
+                    "fields": ["name"],
+                    "filters": [
+                        {"operator": operator, "name": "name", "value": value}
+                    ],
+                }
+            }
+        }
+        headers = {"Authorization": f"Bearer {view_perm_token}"}
+        response = api_client.post(
+            "/v1/fetch/", fetch_payload, format="json", headers=headers
+        )
+        assert response.status_code == 400
+        assert response.data["code"] == "DGA-V005"
+        assert response.data["error"].startswith(f"Value error, {error}")
+
+    @pytest.mark.parametrize(
+        "filter_group, expected_names",
+        [
+            (
+                {
+                    "operation": "and",
+                    "groups": [
+                        {
+                            "operation": "or",
+                            "filters": [
+                                {
+                                    "operator": "eq",
+                                    "name": "name",
+                                    "value": ["test_user1"],
+                                },
+                                {
+                                    "operator": "eq",
+                                    "name": "name",
+                                    "value": ["test_user2"],
+                                },
+                            ],
+                        },
+                        {
+                            "operation": "or",
+                            "filters": [
+                                {
+                                    "operator": "isnull",
+                                    "name": "std_class",
+                                    "value": [True],
+                                },
+                                {
+                                    "operator": "eq",
+                                    "name": "std_class__name",
+                                    "value": ["Class-2"],
+                                },
+                            ],
+                        },
+                    ],
+                },
+                ["test_user2"],
+            ),
+            (
+                {
+                    "operation": "not",
+                    "filters": [
+                        {
+                            "operator": "eq",
+                            "name": "name",
+                            "value": ["test_user2"],
+                        },
+                    ],
+                },
+                ["instance_1", "test_user1"],
+            ),
+        ],
+    )
+    def test_fetch_filter_group(
+        self,
+        customer1,
+        customer2,
+        api_client,
+        view_perm_token,
+        filter_group,
+        expected_names,
+    ):
+        """
+        User combines filters with nested and/or/not groups.
+        """
+        baker.make_recipe("demo_app.test_instance")
+        fetch_payload = {
+            "payload": {
+                "variables": {
+                    "modelName": "demo_app.customer",
+                    "fields": ["name"],
+                    "filters": [],
+                    "filterGroup": filter_group,
+                    "sort": {"field": "name", "order_by": "asc"},
+                }
+            }
+        }
+        headers = {"Authorization": f"Bearer {view_perm_token}"}
+        response = api_client.post(
+            "/v1/fetch/", fetch_payload, format="json", headers=headers
+        )
+        assert response.status_code == 200
+        assert [row["name"] for row in response.data["data"]["data"]] == (
+            expected_names
+        )
+
+    def test_fetch_filter_group_too_deep(
+        self, customer1, api_client, view_perm_token
+    ):
+        """
+        Filter groups nested deeper than FILTER_GROUP_MAX_DEPTH are refused.
+        """
+        filter_group = {
+            "operation": "and",
+            "filters": [
+                {"operator": "eq", "name": "name", "value": ["test_user1"]}
+            ],
+        }
+        for _ in range(5):
+            filter_group = {"operation": "and", "groups": [filter_group]}
+        fetch_payload = {
+            "payload": {
+                "variables": {
+                    "modelName": "demo_app.customer",
+                    "fields": ["name"],
+                    "filters": [],
+                    "filterGroup": filter_group,
+                }
+            }
+        }
+        headers = {"Authorization": f"Bearer {view_perm_token}"}
+        response = api_client.post(
+            "/v1/fetch/", fetch_payload, format="json", headers=headers
+        )
+        assert response.status_code == 400
+        assert response.data["code"] == "DGA-V005"
+        assert response.data["error"] == (
+            "Value error, Filter groups are limited to 5 levels"
+            "('filterGroup',)"
+        )
+
+    def test_fetch_large_in_filter(
+        self, customer1, customer2, api_client, view_perm_token
+    ):
+        """
+        Large 'in' lists are sent as one JSON array parameter.
+        """
+        ids = list(range(100000, 102000)) + [customer2.id]
+        fetch_payload = {
+            "payload": {
+                "variables": {
+                    "modelName": "demo_app.customer",
+                    "fields": ["name"],
+                    "filters": [
+                        {"operator": "in", "name": "id", "value": ids}
+                    ],
+                }
+            }
+        }
+        headers = {"Authorization": f"Bearer {view_perm_token}"}
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.post(
+                "/v1/fetch/", fetch_payload, format="json", headers=headers
+            )
+        assert response.status_code == 200
+        assert response.data["data"]["total"] == 1
+        assert response.data["data"]["data"] == [{"name": "test_user2"}]
+        assert any(
+            "json_each" in query["sql"] for query in queries.captured_queries
+        )
+
+    def test_fetch_large_in_filter_invalid_value(
+        self, customer1, api_client, view_perm_token
+    ):
+        """
+        Values of large 'in' lists are validated.
+        """
+        ids = list(range(100000, 102000)) + ["abc"]
+        fetch_payload = {
+            "payload": {
+                "variables": {
+                    "modelName": "demo_app.customer",
+                    "fields": ["name"],
+                    "filters": [
+                        {"operator": "in", "name": "id", "value": ids}
+                    ],
+                }
+            }
+        }
+        headers = {"Authorization": f"Bearer {view_perm_token}"}
+        response = api_client.post(
+            "/v1/fetch/", fetch_payload, format="json", headers=headers
+        )
+        assert response.status_code == 400
+        assert response.data["code"] == "DGA-S002"
+
+    def test_fetch_in_query_filter(
+        self, customer1, customer2, api_client, view_perm_user, view_perm_token
+    ):
+        """
+        User filters by the records of another model in one query.
+        """
+        view_perm_user.user_permissions.add(
+            Permission.objects.get(codename="view_studentclass")
+        )
+        fetch_payload = {
+            "payload": {
+                "variables": {
+                    "modelName": "demo_app.customer",
+                    "fields": ["name"],
+                    "filters": [
+                        {
+                            "operator": "inQuery",
+                            "name": "std_class",
+                            "value": [
+                                {
+                                    "modelName": "demo_app.studentclass",
+                                    "field": "id",
+                                    "filters": [
+                                        {
+                                            "operator": "eq",
+                                            "name": "name",
+                                            "value": ["Class-1"],
+                                        }
+                                    ],
+                                }
+                            ],
+                        }
+                    ],
+                }
+            }
+        }
+        headers = {"Authorization": f"Bearer {view_perm_token}"}
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.post(
+                "/v1/fetch/", fetch_payload, format="json", headers=headers
+            )
+        assert response.status_code == 200
+        assert response.data["data"]["data"] == [{"name": "test_user1"}]
+        # info: the student classes are not queried on their own
+        assert not [
+            query
+            for query in queries.captured_queries
+            if query["sql"].startswith('SELECT "demo_app_studentclass"')
+        ]
+
+    def test_fetch_in_query_filter_without_permission(
+        self, customer1, api_client, view_perm_token
+    ):
+        """
+        The model of an inQuery filter needs the 'view' permission.
+        """
+        fetch_payload = {
+            "payload": {
+                "variables": {
+                    "modelName": "demo_app.customer",
+                    "fields": ["name"],
+                    "filters": [
+                        {
+                            "operator": "inQuery",
+                            "name": "std_class",
+                            "value": [
+                                {
+                                    "modelName": "demo_app.studentclass",
+                                    "field": "id",
+                                }
+                            ],
+                        }
+                    ],
+                }
+            }
+        }
+        headers = {"Authorization": f"Bearer {view_perm_token}"}
+        response = api_client.post(
+            "/v1/fetch/", fetch_payload, format="json", headers=headers
+        )
+        assert response.status_code == 404
+        assert response.data["code"] == "DGA-V007"
+
+    def test_fetch_search_filter(
+        self, customer1, customer2, api_client, view_perm_token
+    ):
+        """
+        User searches the words of a text field through its search index,
+        which follows the records saved after it was built.
+        """
+        call_command(SearchIndexCommand(), "demo_app.customer", "address")
+        baker.make(Customer, name="test_user3", address="Old Goa beach")
+        headers = {"Authorization": f"Bearer {view_perm_token}"}
+        names = []
+        for text in ["hyderabad", "goa beach", "beach hyderabad"]:
+            fetch_payload = {
+                "payload": {
+                    "variables": {
+                        "modelName": "demo_app.customer",
+                        "fields": ["name"],
+                        "filters": [
+                            {
+                                "operator": "search",
+                                "name": "address",
+                                "value": [text],
+                            }
+                        ],
+                        "sort": {"field": "name", "order_by": "asc"},
+                    }
+                }
+            }
+            response = api_client.post(
+                "/v1/fetch/", fetch_payload, format="json", headers=headers
+            )
+            assert response.status_code == 200
+            names.append(
+                [record["name"] for record in response.data["data"]["data"]]
+            )
+        assert names == [["test_user1", "test_user2"], ["test_user3"], []]
+
+    def test_fetch_search_rank(self, api_client, view_perm_token):
+        """
+        Search rank orders the best matches first, before the sort.
+        """
+        baker.make(Customer, name="a_user", address="north goa road")
+        baker.make(Customer, name="b_user", address="goa goa")
+        call_command(SearchIndexCommand(), "demo_app.customer", "address")
+        fetch_payload = {
+            "payload": {
+                "variables": {
+                    "modelName": "demo_app.customer",
+                    "fields": ["name"],
+                    "filters": [
+                        {
+                            "operator": "search",
+                            "name": "address",
+                            "value": ["goa"],
+                        }
+                    ],
+                    "sort": {"field": "name", "order_by": "asc"},
+                    "searchRank": True,
+                }
+            }
+        }
+        headers = {"Authorization": f"Bearer {view_perm_token}"}
+        response = api_client.post(
+            "/v1/fetch/", fetch_payload, format="json", headers=headers
+        )
+        assert response.status_code == 200
+        assert response.data["data"]["data"] == [
+            {"name": "b_user"},
+            {"name": "a_user"},
+        ]
+
+    def test_fetch_search_index_dropped(
+        self, customer1, api_client, view_perm_token
+    ):
+        """
+        A search index dropped by another process, after the filter plan
+        was cached, returns an error instead of failing the query.
+        """
+        call_command(SearchIndexCommand(), "demo_app.customer", "address")
+        fetch_payload = {
+            "payload": {
+                "variables": {
+                    "modelName": "demo_app.customer",
+                    "fields": ["name"],
+                    "filters": [
+                        {
+                            "operator": "search",
+                            "name": "address",
+                            "value": ["hyderabad"],
+                        }
+                    ],
+                }
+            }
+        }
+        headers = {"Authorization": f"Bearer {view_perm_token}"}
+        response = api_client.post(
+            "/v1/fetch/", fetch_payload, format="json", headers=headers
+        )
+        assert response.status_code == 200
+        with connection.cursor() as cursor:
+            # info: dropped without clearing the cached plans of this process
+            cursor.execute('DROP TABLE "dga_search_demo_app_customer_address"')
+        response = api_client.post(
+            "/v1/fetch/", fetch_payload, format="json", headers=headers
+        )
+        assert response.status_code == 400
+        assert response.data["code"] == "DGA-S020"
+
+    def test_fetch_search_plan_compiled_in_another_thread(
+        self, customer1, customer2
+    ):
+        """
+        A filter plan compiled in one thread serves the search and large
+        'in' filters of another, with the database connection of the thread
+        using it.
+        """
+        call_command(SearchIndexCommand(), "demo_app.customer", "address")
+        compile_filter_plan.cache_clear()
+        filters = [
+            FetchFilter(
+                operator="search", name="address", value=["hyderabad"]
+            ),
+            FetchFilter(
+                operator="in",
+                name="name",
+                value=["test_user1", "test_user2"],
+            ),
+        ]
+        thread = threading.Thread(
+            target=compile_filter_plan,
+            args=(Customer, get_filter_shape(filters)),
+        )
+        thread.start()
+        thread.join()
+        with patch(
+            "django_generic_api.django_generic_api.services"
+            ".large_in_threshold",
+            1,
+        ):
+            result = fetch_data(
+                Customer,
+                filters,
+                ["name"],
+                1,
+                10,
+                FetchSort(field="name", order_by="asc"),
+            )
+        compile_filter_plan.cache_clear()
+        assert result["data"] == [
+            {"name": "test_user1"},
+            {"name": "test_user2"},
+        ]
+
+    def test_fetch_search_unavailable(
+        self, customer1, api_client, view_perm_token
+    ):
+        """
+        Search needs a built index, on a text field of the model.
+        """
+        compile_filter_plan.cache_clear()
+        headers = {"Authorization": f"Bearer {view_perm_token}"}
+        codes = []
+        for field_name in ["address", "std_class__name"]:
+            fetch_payload = {
+                "payload": {
+                    "variables": {
+                        "modelName": "demo_app.customer",
+                        "fields": ["name"],
+                        "filters": [
+                            {
+                                "operator": "search",
+                                "name": field_name,
+                                "value": ["hyderabad"],
+                            }
+                        ],
+                    }
+                }
+            }
+            response = api_client.post(
+                "/v1/fetch/", fetch_payload, format="json", headers=headers
+            )
+            assert response.status_code == 400
+            codes.append(response.data["code"])
+        assert codes == ["DGA-S020", "DGA-S019"]
+
+    def test_fetch_facets(
+        self, customer1, customer2, api_client, view_perm_token
+    ):
+        """
+        User fetches the most frequent values of facet fields with the
+        records, cached with the exact counts.
+        """
+        baker.make(Customer, name="test_user3", address="hyderabad")
+        fetch_payload = {
+            "payload": {
+                "variables": {
+                    "modelName": "demo_app.customer",
+                    "fields": ["name"],
+                    "filters": [
+                        {
+                            "operator": "not",
+                            "name": "name",
+                            "value": ["instance_1"],
+                        }
+                    ],
+                    "pageSize": 1,
+                    "facets": ["address", "std_class__name"],
+                    "facetSize": 1,
+                }
+            }
+        }
+        headers = {"Authorization": f"Bearer {view_perm_token}"}
+        results = []
+        with patch(
+            "django_generic_api.django_generic_api.services"
+            ".count_cache_timeout",
+            60,
+        ):
+            for _ in range(2):
+                response = api_client.post(
+                    "/v1/fetch/",
+                    fetch_payload,
+                    format="json",
+                    headers=headers,
+                )
+                assert response.status_code == 200
+                results.append(response.data["data"]["facets"])
+                baker.make(Customer, address="GOA")
+        cache.clear()
+        assert results[0] == {
+            "address": [{"value": "hyderabad", "count": 2}],
+            "std_class__name": [{"value": None, "count": 2}],
+        }
+        assert results[1] == results[0]
+
+    def test_fetch_facets_of_value_field(
+        self, api_client, view_perm_user, view_perm_token
+    ):
+        """
+        Facets of a field named 'value' do not clash with the count keys.
+        """
+        view_perm_user.user_permissions.add(
+            Permission.objects.get(codename="view_premiumcustomer")
+        )
+        baker.make(PremiumCustomer, value=5, _quantity=2)
+        baker.make(PremiumCustomer, value=7)
+        fetch_payload = {
+            "payload": {
+                "variables": {
+                    "modelName": "demo_app.premiumcustomer",
+                    "fields": ["name"],
+                    "filters": [],
+                    "facets": ["value"],
+                }
+            }
+        }
+        headers = {"Authorization": f"Bearer {view_perm_token}"}
+        response = api_client.post(
+            "/v1/fetch/", fetch_payload, format="json", headers=headers
+        )
+        assert response.status_code == 200
+        assert response.data["data"]["facets"] == {
+            "value": [{"value": 5, "count": 2}, {"value": 7, "count": 1}]
+        }
+
+    def test_fetch_distinct_when_needed(
+        self, customer1, api_client, view_perm_user, view_perm_token
+    ):
+        """
+        DISTINCT is only applied when asked for, or when a field crosses a
+        to-many relation.
+        """
+        view_perm_user.user_permissions.add(
+            Permission.objects.get(codename="view_studentclass")
+        )
+        baker.make(Customer, std_class=customer1.std_class)
+        headers = {"Authorization": f"Bearer {view_perm_token}"}
+        distinct_queries = []
+        for model_name, fields, distinct in [
+            ("demo_app.customer", ["name"], None),
+            ("demo_app.customer", ["name"], True),
+            ("demo_app.studentclass", ["name"], None),
+            ("demo_app.studentclass", ["class_of_student__name"], None),
+        ]:
+            fetch_payload = {
+                "payload": {
+                    "variables": {
+                        "modelName": model_name,
+                        "fields": fields,
+                        "filters": [],
+                        "distinct": distinct,
+                    }
+                }
+            }
+            with CaptureQueriesContext(connection) as queries:
+                response = api_client.post(
+                    "/v1/fetch/", fetch_payload, format="json", headers=headers
+                )
+            assert response.status_code == 200
+            distinct_queries.append(
+                any(
+                    "DISTINCT" in query["sql"]
+                    for query in queries.captured_queries
+                )
+            )
+        assert distinct_queries == [False, True, False, True]
+
+    def test_fetch_distinct_after_foreign_key(
+        self, customer1, api_client, view_perm_token
+    ):
+        """
+        A to-many relation reached through a foreign key also makes the
+        fetch DISTINCT.
+        """
+        baker.make(Customer, name="test_user3", std_class=customer1.std_class)
+        fetch_payload = {
+            "payload": {
+                "variables": {
+                    "modelName": "demo_app.customer",
+                    "fields": ["name"],
+                    "filters": [
+                        {
+                            "operator": "gt",
+                            "name": "std_class__class_of_student",
+                            "value": [0],
+                        }
+                    ],
+                    "sort": {"field": "name", "order_by": "asc"},
+                }
+            }
+        }
+        headers = {"Authorization": f"Bearer {view_perm_token}"}
+        response = api_client.post(
+            "/v1/fetch/", fetch_payload, format="json", headers=headers
+        )
+        assert response.status_code == 200
+        assert response.data["data"]["total"] == 2
+        assert response.data["data"]["data"] == [
+            {"name": "test_user1"},
+            {"name": "test_user3"},
+        ]
+
+    def test_fetch_distinct_on_unsupported(
+        self, customer1, api_client, view_perm_token
+    ):
+        """
+        DISTINCT ON fields needs a database supporting it.
+        """
+        fetch_payload = {
+            "payload": {
+                "variables": {
+                    "modelName": "demo_app.customer",
+                    "fields": ["name", "address"],
+                    "filters": [],
+                    "distinctOn": ["address"],
+                }
+            }
+        }
+        headers = {"Authorization": f"Bearer {view_perm_token}"}
+        response = api_client.post(
+            "/v1/fetch/", fetch_payload, format="json", headers=headers
+        )
+        assert response.status_code == 400
+        assert response.data["code"] == "DGA-S022"
+
+    def test_fetch_multi_key_sort(
+        self, customer1, customer2, api_client, view_perm_token
+    ):
+        """
+        User sorts by several keys, related fields and null placement
+        included, and the pk breaks the remaining ties.
+        """
+        baker.make(Customer, name="test_user3", std_class=customer1.std_class)
+        fetch_payload = {
+            "payload": {
+                "variables": {
+                    "modelName": "demo_app.customer",
+                    "fields": ["name"],
+                    "filters": [],
+                    "sort": [
+                        {
+                            "field": "std_class__name",
+                            "order_by": "asc",
+                            "nulls": "last",
+                        },
+                        {"field": "name", "order_by": "desc"},
+                    ],
+                }
+            }
+        }
+        headers = {"Authorization": f"Bearer {view_perm_token}"}
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.post(
+                "/v1/fetch/", fetch_payload, format="json", headers=headers
+            )
+        assert response.status_code == 200
+        assert response.data["data"]["data"] == [
+            {"name": "test_user3"},
+            {"name": "test_user1"},
+            {"name": "test_user2"},
+        ]
+        assert queries.captured_queries[-1]["sql"].endswith(
+            '"demo_app_customer"."id" ASC LIMIT 10'
+        )
+
+    def test_fetch_cursor_multi_key_sort(
+        self, customer1, api_client, view_perm_token
+    ):
+        """
+        Cursor pagination sorts by a single key.
+        """
+        fetch_payload = {
+            "payload": {
+                "variables": {
+                    "modelName": "demo_app.customer",
+                    "fields": ["name"],
+                    "filters": [],
+                    "pagination": "cursor",
+                    "sort": [
+                        {"field": "name", "order_by": "asc"},
+                        {"field": "email", "order_by": "asc"},
+                    ],
+                }
+            }
+        }
+        headers = {"Authorization": f"Bearer {view_perm_token}"}
+        response = api_client.post(
+            "/v1/fetch/", fetch_payload, format="json", headers=headers
+        )
+        assert response.status_code == 400
+        assert response.data["code"] == "DGA-V005"
+
+    def test_fetch_nested_relations(
+        self, customer1, customer2, api_client, view_perm_user, view_perm_token
+    ):
+        """
+        User fetches classes with their customers nested, one IN query per
+        relation level.
+        """
+        view_perm_user.user_permissions.add(
+            Permission.objects.get(codename="view_studentclass")
+        )
+        baker.make(Customer, name="test_user3", std_class=customer1.std_class)
+        fetch_payload = {
+            "payload": {
+                "variables": {
+                    "modelName": "demo_app.studentclass",
+                    "fields": ["name"],
+                    "filters": [],
+                    "relations": [
+                        {
+                            "name": "class_of_student",
+                            "fields": ["name"],
+                            "sort": {"field": "name", "order_by": "desc"},
+                            "relations": [
+                                {"name": "std_class", "fields": ["address"]}
+                            ],
+                        }
+                    ],
+                }
+            }
+        }
+        headers = {"Authorization": f"Bearer {view_perm_token}"}
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.post(
+                "/v1/fetch/", fetch_payload, format="json", headers=headers
+            )
+        assert response.status_code == 200
+        address = customer1.std_class.address
+        assert response.data["data"]["data"] == [
+            {
+                "name": "Class-1",
+                "class_of_student": [
+                    {"name": "test_user3", "std_class": {"address": address}},
+                    {"name": "test_user1", "std_class": {"address": address}},
+                ],
+            }
+        ]
+        assert (
+            len(
+                [
+                    query
+                    for query in queries.captured_queries
+                    if 'FROM "demo_app_customer"' in query["sql"]
+                ]
+            )
+            == 1
+        )
+
+    def test_fetch_nested_relations_limit(
+        self, customer1, api_client, view_perm_user, view_perm_token
+    ):
+        """
+        A to-many relation returns at most 'limit' records per record.
+        """
+        view_perm_user.user_permissions.add(
+            Permission.objects.get(codename="view_studentclass")
+        )
+        baker.make(Customer, name="test_user3", std_class=customer1.std_class)
+        fetch_payload = {
+            "payload": {
+                "variables": {
+                    "modelName": "demo_app.studentclass",
+                    "fields": ["name"],
+                    "filters": [],
+                    "relations": [
+                        {
+                            "name": "class_of_student",
+                            "fields": ["name"],
+                            "limit": 1,
+                        }
+                    ],
+                }
+            }
+        }
+        headers = {"Authorization": f"Bearer {view_perm_token}"}
+        response = api_client.post(
+            "/v1/fetch/", fetch_payload, format="json", headers=headers
+        )
+        assert response.status_code == 200
+        assert response.data["data"]["data"] == [
+            {"name": "Class-1", "class_of_student": [{"name": "test_user1"}]}
+        ]
+
+    def test_fetch_nested_forward_relation(
+        self, customer1, customer2, api_client, view_perm_user, view_perm_token
+    ):
+        """
+        A foreign key relation is read with a join, and is None for records
+        without a related record.
+        """
+        view_perm_user.user_permissions.add(
+            Permission.objects.get(codename="view_studentclass")
+        )
+        fetch_payload = {
+            "payload": {
+                "variables": {
+                    "modelName": "demo_app.customer",
+                    "fields": ["name"],
+                    "filters": [],
+                    "sort": {"field": "name", "order_by": "asc"},
+                    "relations": [
+                        {"name": "std_class", "fields": ["name", "address"]}
+                    ],
+                }
+            }
+        }
+        headers = {"Authorization": f"Bearer {view_perm_token}"}
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.post(
+                "/v1/fetch/", fetch_payload, format="json", headers=headers
+            )
+        assert response.status_code == 200
+        assert response.data["data"]["data"] == [
+            {
+                "name": "test_user1",
+                "std_class": {
+                    "name": "Class-1",
+                    "address": customer1.std_class.address,
+                },
+            },
+            {"name": "test_user2", "std_class": None},
+        ]
+        assert not [
+            query
+            for query in queries.captured_queries
+            if query["sql"].startswith('SELECT "demo_app_studentclass"')
+        ]
+
+    def test_fetch_nested_relations_without_permission(
+        self, customer1, api_client, view_perm_token
+    ):
+        """
+        The models of nested relations need the 'view' permission.
+        """
+        fetch_payload = {
+            "payload": {
+                "variables": {
+                    "modelName": "demo_app.customer",
+                    "fields": ["name"],
+                    "filters": [],
+                    "relations": [{"name": "std_class", "fields": ["name"]}],
+                }
+            }
+        }
+        headers = {"Authorization": f"Bearer {view_perm_token}"}
+        response = api_client.post(
+            "/v1/fetch/", fetch_payload, format="json", headers=headers
+        )
+        assert response.status_code == 404
+        assert response.data["code"] == "DGA-V007"
+
+    def test_fetch_nested_relation_field_path(
+        self, customer1, api_client, view_perm_token
+    ):
+        """
+        The fields of a relation cannot be paths to other relations.
+        """
+        fetch_payload = {
+            "payload": {
+                "variables": {
+                    "modelName": "demo_app.customer",
+                    "fields": ["name"],
+                    "filters": [],
+                    "relations": [
+                        {
+                            "name": "std_class",
+                            "fields": ["class_of_student__name"],
+                        }
+                    ],
+                }
+            }
+        }
+        headers = {"Authorization": f"Bearer {view_perm_token}"}
+        response = api_client.post(
+            "/v1/fetch/", fetch_payload, format="json", headers=headers
+        )
+        assert response.status_code == 400
+        assert response.data["code"] == "DGA-V005"
+
+    def test_fetch_nested_invalid_relation(
+        self, customer1, api_client, view_perm_token
+    ):
+        """
+        User nests a field which is not a relation.
+        """
+        fetch_payload = {
+            "payload": {
+                "variables": {
+                    "modelName": "demo_app.customer",
+                    "fields": ["name"],
+                    "filters": [],
+                    "relations": [{"name": "email", "fields": ["name"]}],
+                }
+            }
+        }
+        headers = {"Authorization": f"Bearer {view_perm_token}"}
+        response = api_client.post(
+            "/v1/fetch/", fetch_payload, format="json", headers=headers
+        )
+        assert response.status_code == 400
+        assert response.data["code"] == "DGA-S023"
+
+    def test_fetch_filter_plan_reused(
+        self, customer1, customer2, api_client, view_perm_token
+    ):
+        """
+        Filters of the same shape reuse one compiled plan, whatever their
+        values.
+        """
+        headers = {"Authorization": f"Bearer {view_perm_token}"}
+        compile_filter_plan.cache_clear()
+        names = []
+        for customer in [customer1, customer2]:
+            fetch_payload = {
+                "payload": {
+                    "variables": {
+                        "modelName": "demo_app.customer",
+                        "fields": ["name"],
+                        "filters": [
+                            {
+                                "operator": "eq",
+                                "name": "email",
+                                "value": [customer.email],
+                            }
+                        ],
+                    }
+                }
+            }
+            response = api_client.post(
+                "/v1/fetch/", fetch_payload, format="json", headers=headers
+            )
+            names.append(response.data["data"]["data"])
+        assert names == [[{"name": "test_user1"}], [{"name": "test_user2"}]]
+        cache_info = compile_filter_plan.cache_info()
+        assert (cache_info.misses, cache_info.hits) == (1, 1)
+
     def test_payload_missing_field_property(
         self, customer1, api_client, view_perm_token
     ):
@@ -942,8 +2584,9 @@ class TestGenericFetchAPI:
         # Add the newly added operator to the error message while testing
         assert (
             response_data["error"]
-            == "Input should be 'eq', 'in', 'not', 'gt', 'like' or "
-            "'ilike'('filters', 0, "
+            == "Input should be 'eq', 'in', 'not', 'gt', 'like', 'ilike', "
+            "'gte', 'lt', 'lte', 'range', 'startswith', 'istartswith', "
+            "'endswith', 'isnull', 'inQuery' or 'search'('filters', 0, "
             "'operator')"
         )
 
@@ -1223,7 +2866,7 @@ class TestGenericFetchAPI:
         assert (
             response_data["error"]
             == "Input should be a valid dictionary or instance of "
-            "FetchSort('sort',)"
+            "FetchSort('sort', 0)"
         )
 
     def test_extra_keys_in_sort(self, customer1, api_client, view_perm_token):
@@ -1257,7 +2900,7 @@ class TestGenericFetchAPI:
         assert response_data["code"] == "DGA-V005"
         assert (
             response_data["error"]
-            == "Extra inputs are not permitted('sort', 'abc')"
+            == "Extra inputs are not permitted('sort', 0, 'abc')"
         )
 
     def test_invalid_sort_field(self, customer1, api_client, view_perm_token):
@@ -1324,7 +2967,7 @@ class TestGenericFetchAPI:
         assert response_data["code"] == "DGA-V005"
         assert (
             response_data["error"]
-            == "Input should be 'asc' or 'desc'('sort', 'order_by')"
+            == "Input should be 'asc' or 'desc'('sort', 0, 'order_by')"
         )
 
     def test_invalid_distinct_value(
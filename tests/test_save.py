@@ -1,7 +1,18 @@
+import uuid
 from unittest.mock import patch
 
 import pytest
-from django_generic_api.tests.demo_app.models import Customer
+from django.contrib.auth.models import Permission
+from django.db import connection
+from model_bakery import baker
+from django_generic_api.django_generic_api.services import (
+    clear_schema_cache,
+    schema_cache_info,
+)
+from django_generic_api.tests.demo_app.models import (
+    Customer,
+    PremiumCustomer,
+)
 from rest_framework_simplejwt.exceptions import TokenError
 
 from fixtures.api import (
@@ -11,6 +22,7 @@ from fixtures.api import (
     view_perm_token,
     api_client,
     customer1,
+    customer2,
     student_class_1,
 )
 
@@ -133,6 +145,162 @@ class TestGenericSaveAPI:
         assert response_data["data"] == [{"id": [1]}]
         assert response_data["message"] == ["Record created successfully."]
 
+    def test_create_record_reuses_cached_schema(
+        self, api_client, add_perm_token
+    ):
+        """
+        The model schema is built on the first save and reused afterwards.
+        """
+        clear_schema_cache()
+        headers = {"Authorization": f"Bearer {add_perm_token}"}
+        for i in range(2):
+            save_payload = {
+                "payload": {
+                    "variables": {
+                        "modelName": "demo_app.Customer",
+                        "id": None,
+                        "saveInput": [
+                            {
+                                "name": f"test_user{i}",
+                                "dob": "2020-01-21",
+                                "email": f"ltest{i}@mail.com",
+                                "phone_no": "012345",
+                                "address": "HYD",
+                                "pin_code": "100",
+                                "status": "123",
+                            }
+                        ],
+                    }
+                }
+            }
+            response = api_client.post(
+                "/v1/save/",
+                save_payload,
+                format="json",
+                headers=headers,
+            )
+            assert response.status_code == 201
+
+        cache_info = schema_cache_info()
+        assert cache_info.misses == 1
+        assert cache_info.hits == 1
+
+    def test_create_multiple_records(self, api_client, add_perm_token):
+        """
+        User creates several records at once, they are inserted together.
+        """
+        save_payload = {
+            "payload": {
+                "variables": {
+                    "modelName": "demo_app.Customer",
+                    "id": None,
+                    "saveInput": [
+                        {
+                            "name": f"test_user{i}",
+                            "dob": "2020-01-21",
+                            "email": f"ltest{i}@mail.com",
+                            "phone_no": "012345",
+                            "address": "HYD",
+                            "pin_code": "100",
+                            "status": "123",
+                        }
+                        for i in range(3)
+                    ],
+                }
+            }
+        }
+        headers = {"Authorization": f"Bearer {add_perm_token}"}
+        response = api_client.post(
+            "/v1/save/",
+            save_payload,
+            format="json",
+            headers=headers,
+        )
+        response_data = response.data
+        assert response.status_code == 201
+        assert response_data["data"] == [{"id": [1, 2, 3]}]
+        assert response_data["message"] == ["Record created successfully."]
+        assert list(
+            Customer.objects.order_by("id").values_list("name", flat=True)
+        ) == ["test_user0", "test_user1", "test_user2"]
+
+    def test_create_multiple_inherited_records(
+        self, api_client, save_perm_user, add_perm_token
+    ):
+        """
+        Records of a multi-table inherited model are created one by one, as
+        bulk inserts do not support them.
+        """
+        save_perm_user.user_permissions.add(
+            Permission.objects.get(codename="add_premiumcustomer")
+        )
+        save_payload = {
+            "payload": {
+                "variables": {
+                    "modelName": "demo_app.PremiumCustomer",
+                    "saveInput": [
+                        {
+                            "name": f"test_user{i}",
+                            "dob": "2020-01-21",
+                            "email": f"ltest{i}@mail.com",
+                            "level": "silver",
+                        }
+                        for i in range(2)
+                    ],
+                }
+            }
+        }
+        headers = {"Authorization": f"Bearer {add_perm_token}"}
+        response = api_client.post(
+            "/v1/save/", save_payload, format="json", headers=headers
+        )
+        assert response.status_code == 201
+        assert list(
+            PremiumCustomer.objects.order_by("id").values_list("name", "level")
+        ) == [("test_user0", "silver"), ("test_user1", "silver")]
+
+    def test_create_multiple_records_rolls_back(
+        self, api_client, add_perm_token
+    ):
+        """
+        One of the records fails on insert, none of them are saved.
+        """
+        save_payload = {
+            "payload": {
+                "variables": {
+                    "modelName": "demo_app.Customer",
+                    "id": None,
+                    "saveInput": [
+                        {
+                            "name": "test_user1",
+                            "dob": "2020-01-21",
+                            "email": "ltest1@mail.com",
+                        },
+                        {
+                            # dob is not passed which is a required field
+                            "name": "test_user2",
+                            "email": "ltest2@mail.com",
+                        },
+                    ],
+                }
+            }
+        }
+        headers = {"Authorization": f"Bearer {add_perm_token}"}
+        response = api_client.post(
+            "/v1/save/",
+            save_payload,
+            format="json",
+            headers=headers,
+        )
+        response_data = response.data
+        assert response.status_code == 400
+        assert (
+            response_data["error"]
+            == "NOT NULL constraint failed: demo_app_customer.dob"
+        )
+        assert response_data["code"] == "DGA-S007"
+        assert Customer.objects.count() == 0
+
     def test_update_record(self, api_client, add_perm_token, customer1):
         """
         This is a success update scenario.
@@ -583,6 +751,246 @@ class TestGenericSaveAPI:
         assert response_data["error"] == "Only 1 record to update at once"
         assert response_data["code"] == "DGA-S003"
 
+    def test_batch_update_records(
+        self, api_client, add_perm_token, customer1, customer2
+    ):
+        """
+        User updates several records at once, every record has an "id".
+        """
+        save_payload = {
+            "payload": {
+                "variables": {
+                    "modelName": "demo_app.Customer",
+                    "id": None,
+                    "saveInput": [
+                        {"id": customer1.id, "name": "ABCD"},
+                        {"id": customer2.id, "address": "GOA"},
+                    ],
+                }
+            }
+        }
+        headers = {"Authorization": f"Bearer {add_perm_token}"}
+        response = api_client.post(
+            "/v1/save/",
+            save_payload,
+            format="json",
+            headers=headers,
+        )
+        response_data = response.data
+        assert response.status_code == 200
+        assert response_data["data"] == [{"id": [customer1.id, customer2.id]}]
+        assert response_data["message"] == ["Record updated successfully."]
+
+        customer1.refresh_from_db()
+        customer2.refresh_from_db()
+        assert customer1.name == "ABCD"
+        assert customer1.address == "hyderabad"
+        assert customer2.address == "GOA"
+
+    def test_batch_update_unknown_record(
+        self, api_client, add_perm_token, customer1
+    ):
+        """
+        One of the records does not exist, none of the records are updated.
+        """
+        save_payload = {
+            "payload": {
+                "variables": {
+                    "modelName": "demo_app.Customer",
+                    "id": None,
+                    "saveInput": [
+                        {"id": customer1.id, "name": "ABCD"},
+                        {"id": 9000, "name": "EFGH"},
+                    ],
+                }
+            }
+        }
+        headers = {"Authorization": f"Bearer {add_perm_token}"}
+        response = api_client.post(
+            "/v1/save/",
+            save_payload,
+            format="json",
+            headers=headers,
+        )
+        response_data = response.data
+        assert response.status_code == 400
+        assert (
+            response_data["error"] == "Record with (ID) [9000] does not exist"
+        )
+        assert response_data["code"] == "DGA-S006"
+
+        customer1.refresh_from_db()
+        assert customer1.name == "test_user1"
+
+    def test_batch_update_some_records_without_id(
+        self, api_client, add_perm_token, customer1
+    ):
+        """
+        Only some of the records have an "id".
+        """
+        save_payload = {
+            "payload": {
+                "variables": {
+                    "modelName": "demo_app.Customer",
+                    "id": None,
+                    "saveInput": [
+                        {"id": customer1.id, "name": "ABCD"},
+                        {"name": "EFGH"},
+                    ],
+                }
+            }
+        }
+        headers = {"Authorization": f"Bearer {add_perm_token}"}
+        response = api_client.post(
+            "/v1/save/",
+            save_payload,
+            format="json",
+            headers=headers,
+        )
+        response_data = response.data
+        assert response.status_code == 400
+        assert (
+            response_data["error"]
+            == "Either all or none of the records must have an 'id'"
+        )
+        assert response_data["code"] == "DGA-S014"
+
+    @pytest.mark.parametrize("supports_on_conflict", [True, False])
+    def test_upsert_records(
+        self, api_client, add_perm_token, customer1, supports_on_conflict
+    ):
+        """
+        User upserts records by the unique slug field, the existing record is
+        updated and the new one is created. Records carry all required
+        fields, as each of them may be inserted.
+        """
+        new_slug = str(uuid.uuid4())
+        save_payload = {
+            "payload": {
+                "variables": {
+                    "modelName": "demo_app.Customer",
+                    "upsert": ["slug"],
+                    "saveInput": [
+                        {
+                            "slug": str(customer1.slug),
+                            "name": "ABCD",
+                            "dob": "2020-01-21",
+                            "email": "ltest1@mail.com",
+                        },
+                        {
+                            "slug": new_slug,
+                            "name": "EFGH",
+                            "dob": "2020-01-21",
+                            "email": "ltest1@mail.com",
+                        },
+                    ],
+                }
+            }
+        }
+        headers = {"Authorization": f"Bearer {add_perm_token}"}
+        with patch.object(
+            connection.features,
+            "supports_update_conflicts_with_target",
+            supports_on_conflict,
+        ):
+            response = api_client.post(
+                "/v1/save/",
+                save_payload,
+                format="json",
+                headers=headers,
+            )
+        response_data = response.data
+        new_customer = Customer.objects.get(slug=new_slug)
+        assert response.status_code == 200
+        assert response_data["data"] == [
+            {"id": [customer1.id, new_customer.id]}
+        ]
+        assert response_data["message"] == ["Record saved successfully."]
+
+        customer1.refresh_from_db()
+        assert customer1.name == "ABCD"
+        assert customer1.address == "hyderabad"
+        assert new_customer.name == "EFGH"
+        assert Customer.objects.count() == 2
+
+    @pytest.mark.parametrize("supports_on_conflict", [True, False])
+    def test_upsert_inherited_records(
+        self, api_client, save_perm_user, add_perm_token, supports_on_conflict
+    ):
+        """
+        User upserts records of a multi-table inherited model.
+        """
+        save_perm_user.user_permissions.add(
+            Permission.objects.get(codename="add_premiumcustomer"),
+            Permission.objects.get(codename="change_premiumcustomer"),
+        )
+        premium_customer = baker.make(PremiumCustomer, name="ABCD")
+        new_slug = str(uuid.uuid4())
+        save_payload = {
+            "payload": {
+                "variables": {
+                    "modelName": "demo_app.PremiumCustomer",
+                    "upsert": ["slug"],
+                    "saveInput": [
+                        {
+                            "slug": str(premium_customer.slug),
+                            "name": "ABCD",
+                            "dob": "2020-01-21",
+                            "email": "ltest1@mail.com",
+                            "level": "silver",
+                        },
+                        {
+                            "slug": new_slug,
+                            "name": "EFGH",
+                            "dob": "2020-01-21",
+                            "email": "ltest1@mail.com",
+                        },
+                    ],
+                }
+            }
+        }
+        headers = {"Authorization": f"Bearer {add_perm_token}"}
+        with patch.object(
+            connection.features,
+            "supports_update_conflicts_with_target",
+            supports_on_conflict,
+        ):
+            response = api_client.post(
+                "/v1/save/", save_payload, format="json", headers=headers
+            )
+        assert response.status_code == 200
+        assert list(
+            PremiumCustomer.objects.order_by("id").values_list("name", "level")
+        ) == [("ABCD", "silver"), ("EFGH", "gold")]
+
+    def test_upsert_not_unique_fields(self, api_client, add_perm_token):
+        """
+        User upserts by a field that is not unique.
+        """
+        save_payload = {
+            "payload": {
+                "variables": {
+                    "modelName": "demo_app.Customer",
+                    "upsert": ["name"],
+                    "saveInput": [{"name": "ABCD"}],
+                }
+            }
+        }
+        headers = {"Authorization": f"Bearer {add_perm_token}"}
+        response = api_client.post(
+            "/v1/save/",
+            save_payload,
+            format="json",
+            headers=headers,
+        )
+        response_data = response.data
+        assert response.status_code == 400
+        assert (
+            response_data["error"]
+            == "Upsert fields ['name'] are not unique together"
+        )
+        assert response_data["code"] == "DGA-S016"
+
     def test_unknown_save_input_field(self, api_client, add_perm_token):
         """
         User passes a non-existent field in saveInput.
@@ -667,6 +1075,57 @@ class TestGenericSaveAPI:
         )
         assert response_data["code"] == "DGA-S004"
 
+    def test_invalid_save_input_multiple_records(
+        self, api_client, add_perm_token
+    ):
+        """
+        User passes several records, every failing record is reported with
+        its index.
+        """
+        save_payload = {
+            "payload": {
+                "variables": {
+                    "modelName": "demo_app.Customer",
+                    "id": None,
+                    "saveInput": [
+                        {
+                            "name": "test_user1",
+                            "dob": "01Jan2003",
+                            "email": "ltest1@mail.com",
+                        },
+                        {
+                            "name": "test_user2",
+                            "dob": "2024-11-04",
+                            "email": "ltest2@mail.com",
+                        },
+                        {
+                            "name": "test_user3",
+                            "dob": "2024-11-04",
+                            "email": "ltest3@mail.com",
+                            "ABC": "abc",
+                        },
+                    ],
+                }
+            }
+        }
+        headers = {"Authorization": f"Bearer {add_perm_token}"}
+
+        response = api_client.post(
+            "/v1/save/",
+            save_payload,
+            format="json",
+            headers=headers,
+        )
+        response_data = response.data
+        assert response.status_code == 400
+        assert response_data["error"] == [
+            "Record 0: Input should be a valid date or datetime, input is "
+            "too short. ('dob',)",
+            "Record 2: Extra inputs are not permitted. ('ABC',)",
+        ]
+        assert response_data["code"] == "DGA-S004"
+        assert Customer.objects.count() == 0
+
     def test_missing_required_field_save_input(
         self, api_client, add_perm_token
     ):